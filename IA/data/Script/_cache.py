@@ -0,0 +1,43 @@
+# _cache.py
+"""Helpers d'E/S Excel pour les scripts de génération."""
+
+from pathlib import Path
+
+import pandas as pd
+from openpyxl import Workbook
+
+
+def load_xlsx_cached(path, numeric_cols=()):
+    """Lit un fichier xlsx en le mettant en cache au format parquet.
+
+    Le parsing OOXML n'est payé qu'une fois : les exécutions suivantes
+    relisent le parquet colonne tant que le xlsx n'a pas été modifié.
+    Les colonnes de numeric_cols sont coercées en numérique à l'écriture
+    du cache, pour que les lectures suivantes soient déjà typées.
+    """
+    path = Path(path)
+    pq = path.with_suffix(".parquet")
+    if pq.exists() and pq.stat().st_mtime >= path.stat().st_mtime:
+        return pd.read_parquet(pq)
+    df = pd.read_excel(path)
+    for col in numeric_cols:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    try:
+        df.to_parquet(pq)
+    except Exception as e:
+        print(f"[WARN] cache parquet impossible pour {path.name}: {e}")
+    return df
+
+
+def write_xlsx_stream(path, df):
+    """Écrit un DataFrame en xlsx via le mode write-only d'openpyxl.
+
+    Les lignes sont émises au fil de l'eau dans le flux XML : pas de
+    construction du classeur complet en mémoire comme avec to_excel.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(list(df.columns))
+    for row in df.itertuples(index=False, name=None):
+        ws.append(row)
+    wb.save(path)
@@ -0,0 +1,48 @@
+# generate_customer_feedback.py
+import pandas as pd
+import numpy as np
+
+from _cache import load_xlsx_cached, write_xlsx_stream
+
+# -------------------------
+# CONFIG
+# -------------------------
+NB_FEEDBACKS = 50
+
+# Pools de commentaires par palier de note (1-2, 3-4, 5)
+comment_pools = np.array([
+    ["Too expensive", "Not as expected", "Poor fit"],
+    ["Could be better", "Good value", "Nice design"],
+    ["Great quality!", "Fast delivery", "Love the style!"],
+])
+
+
+def run():
+    rng = np.random.default_rng(42)
+
+    customers = load_xlsx_cached("../../extended data/customers_data_extended.xlsx")
+
+    # Tirages vectorisés : un appel NumPy par colonne au lieu d'une boucle Python
+    ratings = rng.choice([1, 2, 3, 4, 5], size=NB_FEEDBACKS, p=[0.05, 0.1, 0.2, 0.3, 0.35])
+    tier = np.where(ratings == 5, 2, np.where(ratings >= 3, 1, 0))
+    comments = comment_pools[tier, rng.integers(0, 3, NB_FEEDBACKS)]
+
+    customer_ids = rng.choice(customers["Customer_ID"].to_numpy(), NB_FEEDBACKS)
+    date_range = pd.date_range("2023-01-01", "2023-06-30", freq="D")
+    dates = rng.choice(date_range.values, NB_FEEDBACKS)
+
+    df_feedback = pd.DataFrame({
+        "Feedback_ID": np.arange(5000, 5000 + NB_FEEDBACKS, dtype=np.int32),
+        "Customer_ID": customer_ids.astype(np.int32),
+        "Rating": ratings.astype(np.int32),
+        "Comment": comments,
+        "Date": dates,
+    })
+    df_feedback.to_csv("../customer_feedback.csv", index=False)
+    df_feedback.to_parquet("../customer_feedback.parquet", index=False)
+    write_xlsx_stream("../customer_feedback.xlsx", df_feedback)
+    print(f"[OK] customer_feedback généré avec {len(df_feedback)} lignes")
+
+
+if __name__ == "__main__":
+    run()
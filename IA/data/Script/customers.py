@@ -0,0 +1,46 @@
+# generate_customers.py
+import pandas as pd
+import numpy as np
+from faker import Faker
+
+from _cache import write_xlsx_stream
+
+fake = Faker()
+
+# -------------------------
+# CONFIG
+# -------------------------
+NB_CUSTOMERS = 49
+
+locations = ["New York", "Los Angeles", "Chicago", "Houston", "Phoenix", "Miami", "Seattle", "Boston"]
+channels = ["Online", "In-Store"]
+
+
+def run():
+    Faker.seed(42)
+    rng = np.random.default_rng(42)
+
+    # Faker ne sert qu'aux noms ; toutes les autres colonnes sont tirées en bloc
+    names = np.array([fake.name() for _ in range(NB_CUSTOMERS)])
+    join_dates = np.datetime64("2020-01-01") + rng.integers(0, 4 * 365, NB_CUSTOMERS).astype("timedelta64[D]")
+
+    df_customers = pd.DataFrame({
+        "Customer_ID": np.arange(2001, 2001 + NB_CUSTOMERS, dtype=np.int32),
+        "Name": names,
+        "Age": rng.integers(18, 66, NB_CUSTOMERS, dtype=np.int32),
+        "Gender": rng.choice(["Female", "Male"], NB_CUSTOMERS),
+        "Location": rng.choice(locations, NB_CUSTOMERS),
+        "Join_Date": join_dates,
+        "Total_Spent": rng.integers(50, 2501, NB_CUSTOMERS, dtype=np.int32),
+        "Income": rng.integers(30000, 120001, NB_CUSTOMERS, dtype=np.int32),
+        "Preferred_Channel": rng.choice(channels, NB_CUSTOMERS),
+        "Email_Open_Rate": np.round(rng.uniform(0.1, 0.9, NB_CUSTOMERS), 2).astype(np.float32),
+    })
+    df_customers.to_csv("../../extended data/customers_data_extended.csv", index=False)
+    df_customers.to_parquet("../../extended data/customers_data_extended.parquet", index=False)
+    write_xlsx_stream("../../extended data/customers_data_extended.xlsx", df_customers)
+    print(f"[OK] customers_data_extended généré avec {len(df_customers)} clients")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,43 @@
+# generate_marketing.py
+import pandas as pd
+import numpy as np
+
+from _cache import write_xlsx_stream
+
+channels = ["Online", "Social", "Email", "In-Store", "TV"]
+
+
+def run():
+    rng = np.random.default_rng(42)
+
+    # 6 mois x 5 canaux tirés en une passe vectorisée de 30 éléments
+    N = 30
+    months = np.repeat(np.arange(1, 7), len(channels))
+    ch_idx = np.tile(np.arange(len(channels)), 6)
+
+    budgets = rng.choice([500, 1000, 1500, 2000, 3000], N)
+    impressions = budgets * rng.integers(15, 30, N)
+    clicks = (impressions * rng.uniform(0.02, 0.1, N)).astype(np.int32)
+    conversions = (clicks * rng.uniform(0.05, 0.25, N)).astype(np.int32)
+
+    starts = pd.to_datetime({"year": np.full(N, 2023), "month": months, "day": np.ones(N)})
+    ends = starts + pd.Timedelta(days=27)
+
+    df_marketing = pd.DataFrame({
+        "Campaign_ID": (months * 10 + ch_idx + 1).astype(np.int32),
+        "Channel": np.array(channels)[ch_idx],
+        "Start_Date": starts,
+        "End_Date": ends,
+        "Budget": budgets.astype(np.int32),
+        "Impressions": impressions.astype(np.int32),
+        "Clicks": clicks,
+        "Conversions": conversions,
+    })
+    df_marketing.to_csv("../../extended data/marketing_data_extended.csv", index=False)
+    df_marketing.to_parquet("../../extended data/marketing_data_extended.parquet", index=False)
+    write_xlsx_stream("../../extended data/marketing_data_extended.xlsx", df_marketing)
+    print(f"[OK] marketing_data_extended généré avec {len(df_marketing)} campagnes")
+
+
+if __name__ == "__main__":
+    run()
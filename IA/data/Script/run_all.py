@@ -0,0 +1,51 @@
+# run_all.py
+"""Exécute tous les générateurs de données en parallèle avec joblib.
+
+customers doit précéder sales et customer_data (qui relisent le fichier
+clients) ; les autres générateurs sont indépendants et tournent chacun
+dans leur propre processus, ce qui recouvre le calcul et les I/O.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from joblib import Parallel, delayed
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+TRUE_DATA_DIR = SCRIPT_DIR.parent.parent / "true_data"
+sys.path.insert(0, str(SCRIPT_DIR))
+sys.path.insert(0, str(TRUE_DATA_DIR))
+
+import customer_data
+import customers
+import incidents
+import login
+import marketing
+import sales
+
+
+def _run_in(directory, func):
+    """Exécute un générateur depuis son répertoire de travail attendu."""
+    os.chdir(directory)
+    func()
+
+
+def main():
+    stage1 = [
+        (SCRIPT_DIR, customers.run),
+        (SCRIPT_DIR, marketing.run),
+        (TRUE_DATA_DIR, incidents.run),
+        (TRUE_DATA_DIR, login.run),
+    ]
+    stage2 = [
+        (SCRIPT_DIR, sales.run),
+        (SCRIPT_DIR, customer_data.run),
+    ]
+    with Parallel(n_jobs=4) as parallel:
+        parallel(delayed(_run_in)(d, f) for d, f in stage1)
+        parallel(delayed(_run_in)(d, f) for d, f in stage2)
+
+
+if __name__ == "__main__":
+    main()
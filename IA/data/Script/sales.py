@@ -0,0 +1,52 @@
+# generate_sales.py
+import pandas as pd
+import numpy as np
+
+from _cache import load_xlsx_cached, write_xlsx_stream
+
+# -------------------------
+# CONFIG
+# -------------------------
+NB_SALES = 100
+
+channels = ["Online", "In-Store"]
+
+
+def run():
+    rng = np.random.default_rng(42)
+
+    products = load_xlsx_cached("../products_data.xlsx", numeric_cols=("Price",))
+    customers = load_xlsx_cached("../../extended data/customers_data_extended.xlsx")
+
+    date_range = pd.date_range("2023-01-01", "2023-06-30", freq="D")
+
+    # Tirages vectorisés : index aléatoires sur des tableaux extraits une seule
+    # fois au lieu de products.sample(1).iloc[0] à chaque itération
+    prod_ids = products["Product_ID"].to_numpy()
+    prod_prices = products["Price"].to_numpy(np.float64)
+    cust_ids = customers["Customer_ID"].to_numpy()
+
+    pi = rng.integers(0, len(prod_ids), NB_SALES)
+    ci = rng.integers(0, len(cust_ids), NB_SALES)
+    quantities = rng.integers(1, 4, NB_SALES, dtype=np.int32)
+    discounts = rng.choice([0.0, 0.1], NB_SALES, p=[0.8, 0.2]).astype(np.float32)
+    sale_prices = np.round(prod_prices[pi] * quantities * (1 - discounts), 2).astype(np.float32)
+
+    df_sales = pd.DataFrame({
+        "Sale_ID": np.arange(1000, 1000 + NB_SALES, dtype=np.int32),
+        "Product_ID": prod_ids[pi].astype(np.int32),
+        "Customer_ID": cust_ids[ci].astype(np.int32),
+        "Date": rng.choice(date_range.values, NB_SALES),
+        "Quantity": quantities,
+        "Sale_Price": sale_prices,
+        "Channel": rng.choice(channels, NB_SALES),
+        "Discount_Applied": discounts > 0,
+    })
+    df_sales.to_csv("../../extended data/sales_data_extended.csv", index=False)
+    df_sales.to_parquet("../../extended data/sales_data_extended.parquet", index=False)
+    write_xlsx_stream("../../extended data/sales_data_extended.xlsx", df_sales)
+    print(f"[OK] sales_data_extended généré avec {len(df_sales)} ventes")
+
+
+if __name__ == "__main__":
+    run()
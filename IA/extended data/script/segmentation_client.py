@@ -0,0 +1,45 @@
+# segmentation_client.py
+import pandas as pd
+import polars as pl
+from pathlib import Path
+from sklearn.preprocessing import StandardScaler
+from sklearn.cluster import KMeans
+
+# Le parquet généré par les scripts de data/Script permet de ne lire que
+# les colonnes utiles ; l'Excel d'origine reste le repli
+if Path("../sales_data_extended.parquet").exists():
+    sales = pd.read_parquet("../sales_data_extended.parquet",
+                            columns=["Customer_ID", "Sale_Price"])
+    cust = pd.read_parquet("../customers_data_extended.parquet",
+                           columns=["Customer_ID", "Age", "Gender"])
+else:
+    sales = pd.read_excel("../sales_data_extended.xlsx")
+    cust = pd.read_excel("../customers_data_extended.xlsx")
+
+# Agrégation et jointure en Polars : hash-aggregation parallèle sur
+# colonnes Arrow, puis retour en pandas uniquement pour sklearn
+features = (
+    pl.from_pandas(sales)
+      .group_by("Customer_ID")
+      .agg([
+          pl.col("Sale_Price").sum().alias("Total_Spent"),
+          pl.len().alias("Num_Purchases"),
+          pl.col("Sale_Price").mean().alias("Avg_Order_Value"),
+      ])
+      .join(pl.from_pandas(cust).select(["Customer_ID", "Age", "Gender"]), on="Customer_ID")
+      .to_pandas()
+)
+
+features = features.fillna(0)
+
+X = features[["Total_Spent", "Num_Purchases", "Avg_Order_Value", "Age"]]
+X_scaled = StandardScaler().fit_transform(X)
+
+kmeans = KMeans(n_clusters=3, n_init=10, random_state=42)
+features["segment"] = kmeans.fit_predict(X_scaled)
+
+print("=== Segments clients ===")
+print(features.groupby("segment")[["Total_Spent", "Num_Purchases", "Avg_Order_Value", "Age"]].mean())
+
+features.to_csv("../segments_clients.csv", index=False)
+print(f"[OK] segments_clients.csv généré avec {len(features)} clients")
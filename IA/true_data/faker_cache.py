@@ -0,0 +1,29 @@
+# faker_cache.py
+"""Accélération de Faker pour les générateurs de données.
+
+random_element passe par la machinerie de distribution pondérée de Faker
+même pour un tirage uniforme, ce qui reconvertit l'OrderedDict de choix à
+chaque appel. On mémorise la liste de choix sur l'OrderedDict lui-même et
+on retombe sur random.choice, payé en O(1) après le premier appel.
+"""
+
+from collections import OrderedDict
+
+from faker.providers import BaseProvider
+
+_original_random_element = BaseProvider.random_element
+
+
+def _fast_random_element(self, elements=("a", "b", "c")):
+    if isinstance(elements, OrderedDict):
+        choices = getattr(elements, "_cached_choice_list", None)
+        if choices is None:
+            choices = tuple(elements.keys())
+            elements._cached_choice_list = choices
+        return self.generator.random.choice(choices)
+    return _original_random_element(self, elements)
+
+
+def patch_random_element():
+    """Installe la version avec cache de BaseProvider.random_element."""
+    BaseProvider.random_element = _fast_random_element
@@ -1,48 +1,62 @@
 # generate_logins.py
 import pandas as pd
 import numpy as np
-import random
 from datetime import datetime
 from faker import Faker
 
+from faker_cache import patch_random_element
+
+patch_random_element()
 fake = Faker()
-Faker.seed(42)
-random.seed(42)
-np.random.seed(42)
 
 # -------------------------
 # CONFIG
 # -------------------------
 NB_UTILISATEURS = 150      # plus d'utilisateurs
 NB_LOGINS = 20000          # plus de tentatives
+NB_IPS = 500               # pool d'adresses IP réutilisées
 
 roles = ["Employé", "Manager", "Admin système", "Développeur", "Support IT", "Stagiaire"]
 departements = ["RH", "IT", "Ventes", "Marketing", "Production", "Comptabilité", "Logistique"]
 countries = ["France", "USA", "Canada", "Allemagne", "Japon", "Brésil", "Espagne", "Italie", "Unknown"]
 
-utilisateurs = [fake.user_name() for _ in range(NB_UTILISATEURS)]
-role_user = {u: random.choice(roles) for u in utilisateurs}
-dept_user = {u: random.choice(departements) for u in utilisateurs}
-
 start_login_date = datetime(2024, 1, 1)
 end_login_date = datetime(2025, 8, 1)
 
-logins_data = []
-for _ in range(NB_LOGINS):
-    user = random.choice(utilisateurs)
-    role = role_user[user]
-    dept = dept_user[user]
-    date_login = fake.date_time_between(start_date=start_login_date, end_date=end_login_date)
-    ip = fake.ipv4_public()
-    country = random.choice(countries)
+
+def run():
+    Faker.seed(42)
+    rng = np.random.default_rng(42)
+
+    # Faker ne sert qu'à la création unique des entités, jamais dans le tirage par ligne
+    utilisateurs = np.array([fake.user_name() for _ in range(NB_UTILISATEURS)])
+    roles_user = rng.choice(roles, NB_UTILISATEURS)
+    depts_user = rng.choice(departements, NB_UTILISATEURS)
+    ip_pool = np.array([fake.ipv4_public() for _ in range(NB_IPS)])
+
+    # Tirages vectorisés : un appel NumPy par colonne au lieu de 20 000 itérations
+    user_idx = rng.integers(0, NB_UTILISATEURS, NB_LOGINS)
+    roles_col = roles_user[user_idx]
+    span = int((end_login_date - start_login_date).total_seconds())
+    dates = np.datetime64(start_login_date) + rng.integers(0, span, NB_LOGINS).astype("timedelta64[s]")
+
     # Probabilité d'échec plus forte pour certains rôles
-    p_fail = 0.2 if role != "Admin système" else 0.1
-    result = np.random.choice(["succès", "échec"], p=[1-p_fail, p_fail])
-    logins_data.append([user, role, dept, date_login, ip, country, result])
-
-df_logins = pd.DataFrame(logins_data, columns=[
-    "Utilisateur", "Role", "Departement", "DateHeure", "IPSource", "Localisation", "Resultat"
-])
-df_logins.sort_values("DateHeure", inplace=True)
-df_logins.to_csv("logins.csv", index=False)
-print(f"[OK] logins.csv généré avec {len(df_logins)} lignes pour {NB_UTILISATEURS} utilisateurs")
+    p_fail = np.where(roles_col == "Admin système", 0.1, 0.2)
+    results = np.where(rng.random(NB_LOGINS) < p_fail, "échec", "succès")
+
+    df_logins = pd.DataFrame({
+        "Utilisateur": utilisateurs[user_idx],
+        "Role": roles_col,
+        "Departement": depts_user[user_idx],
+        "DateHeure": dates,
+        "IPSource": ip_pool[rng.integers(0, NB_IPS, NB_LOGINS)],
+        "Localisation": rng.choice(countries, NB_LOGINS),
+        "Resultat": results,
+    })
+    df_logins.sort_values("DateHeure", inplace=True)
+    df_logins.to_csv("logins.csv", index=False)
+    print(f"[OK] logins.csv généré avec {len(df_logins)} lignes pour {NB_UTILISATEURS} utilisateurs")
+
+
+if __name__ == "__main__":
+    run()
@@ -11,6 +11,50 @@ import matplotlib.pyplot as plt
 from pathlib import Path
 from typing import Tuple
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Copy-on-write: column assignment copies only the touched blocks, so the
+# clean methods no longer need a defensive full-frame copy. Always on from
+# pandas 3.0; enabled explicitly for pandas 2.x.
+if pd.__version__ < "3":
+    pd.options.mode.copy_on_write = True
+
+
+def _clean_numeric(a: np.ndarray) -> np.ndarray:
+    """Replace negative and NaN entries with the median of the valid values.
+
+    Single pass over a float64 array; JIT-compiled when numba is available.
+    """
+    valid = a[a >= 0.0]  # NaN comparisons are False: drops negatives and NaN
+    if valid.size == 0:
+        return a
+    median = np.median(valid)
+    for i in range(a.size):
+        if not (a[i] >= 0.0):
+            a[i] = median
+    return a
+
+
+if njit is not None:
+    _clean_numeric = njit(cache=True)(_clean_numeric)
+
+
+def _normalize_categorical(s: pd.Series, fill_value: str, transform) -> pd.Series:
+    """Apply a string transform over the categories instead of the rows.
+
+    The transform runs on len(categories) elements, missing values are
+    mapped to fill_value, and categories merged by the normalization are
+    deduplicated.
+    """
+    cats = transform(s.cat.categories.astype(str))
+    codes = s.cat.codes.to_numpy()
+    uniq, inverse = np.unique(np.append(cats.to_numpy(), fill_value), return_inverse=True)
+    new_codes = np.where(codes == -1, inverse[-1], inverse[:-1][codes])
+    return pd.Series(pd.Categorical.from_codes(new_codes, uniq), index=s.index)
+
 
 class CyberSecurityDataExplorer:
     """Handles exploration and analysis of cybersecurity data."""
@@ -25,15 +69,18 @@ class CyberSecurityDataExplorer:
         """Load and return both datasets, handling empty rows."""
         # Load with skipna and drop empty rows
         self.incidents_df = pd.read_csv(
-            self.incidents_path, 
+            self.incidents_path,
             parse_dates=["Date"],
-            skip_blank_lines=True
+            skip_blank_lines=True,
+            dtype={"Secteur": "category", "TypeAttaque": "category", "Vecteur": "category"}
         ).dropna(how='all')  # Drop completely empty rows
-        
+
         self.logins_df = pd.read_csv(
-            self.logins_path, 
+            self.logins_path,
             parse_dates=["DateHeure"],
-            skip_blank_lines=True
+            skip_blank_lines=True,
+            dtype={"Resultat": "category", "Role": "category",
+                   "Localisation": "category", "Departement": "category"}
         ).dropna(how='all')  # Drop completely empty rows
         
         # Remove rows where critical columns are empty
@@ -52,57 +99,62 @@ class CyberSecurityDataExplorer:
         """Clean and normalize incidents data."""
         if df.empty:
             return df
-        
-        df = df.copy()
-        
-        # Text normalization - handle NaN values
+
+        # Text normalization - runs over the categories, not the rows
         text_columns = {
-            "Secteur": lambda x: x.fillna("Unknown").str.strip().str.title(),
-            "TypeAttaque": lambda x: x.fillna("unknown").str.strip().str.lower(),
-            "Vecteur": lambda x: x.fillna("unknown").str.strip().str.lower(),
-            "Entreprise": lambda x: x.fillna("Unknown").str.strip()
+            "Secteur": ("Unknown", lambda c: c.str.strip().str.title()),
+            "TypeAttaque": ("unknown", lambda c: c.str.strip().str.lower()),
+            "Vecteur": ("unknown", lambda c: c.str.strip().str.lower()),
+            "Entreprise": ("Unknown", lambda c: c.str.strip())
         }
-        
-        for col, transform in text_columns.items():
+
+        updates = {}
+        for col, (fill_value, transform) in text_columns.items():
             if col in df.columns:
-                df[col] = transform(df[col])
-        
-        # Handle negative or invalid values
+                s = df[col]
+                if not isinstance(s.dtype, pd.CategoricalDtype):
+                    s = s.astype("category")
+                updates[col] = _normalize_categorical(s, fill_value, transform)
+
+        # Handle negative or invalid values in one pass per column
         numeric_columns = ["ImpactAriary", "IndispoHeures", "Taille"]
         for col in numeric_columns:
             if col in df.columns:
-                df.loc[df[col] < 0, col] = np.nan
-                # Fill NaN with median for numeric columns
-                df[col] = df[col].fillna(df[col].median())
-        
-        return df
+                arr = df[col].to_numpy(dtype=np.float64, copy=True)
+                updates[col] = _clean_numeric(arr)
+
+        # assign shares the untouched column blocks instead of copying them
+        return df.assign(**updates)
     
     @staticmethod
     def clean_logins(df: pd.DataFrame) -> pd.DataFrame:
         """Clean and normalize login data."""
         if df.empty:
             return df
-        
-        df = df.copy()
-        
-        # Normalize result column - handle NaN values
-        if "Resultat" in df.columns:
-            df["Resultat"] = df["Resultat"].fillna("unknown").str.lower().str.strip()
-        
-        # Fill missing values and normalize
-        if "Localisation" in df.columns:
-            df["Localisation"] = df["Localisation"].fillna("Unknown").str.title()
-        
-        if "Role" in df.columns:
-            df["Role"] = df["Role"].fillna("Employe").str.title()
-        
+
+        # Normalize low-cardinality columns over their categories
+        text_columns = {
+            "Resultat": ("unknown", lambda c: c.str.lower().str.strip()),
+            "Localisation": ("Unknown", lambda c: c.str.title()),
+            "Role": ("Employe", lambda c: c.str.title())
+        }
+
+        updates = {}
+        for col, (fill_value, transform) in text_columns.items():
+            if col in df.columns:
+                s = df[col]
+                if not isinstance(s.dtype, pd.CategoricalDtype):
+                    s = s.astype("category")
+                updates[col] = _normalize_categorical(s, fill_value, transform)
+
         if "Utilisateur" in df.columns:
-            df["Utilisateur"] = df["Utilisateur"].fillna("Unknown")
-        
+            updates["Utilisateur"] = df["Utilisateur"].fillna("Unknown")
+
         if "IPSource" in df.columns:
-            df["IPSource"] = df["IPSource"].fillna("0.0.0.0")
-        
-        return df
+            updates["IPSource"] = df["IPSource"].fillna("0.0.0.0")
+
+        # assign shares the untouched column blocks instead of copying them
+        return df.assign(**updates)
     
     def display_summary_stats(self) -> None:
         """Display summary statistics for both datasets."""
@@ -138,7 +190,15 @@ class CyberSecurityDataExplorer:
             
             print("\n=== LOGINS: Volume par résultat ===")
             if "Resultat" in self.logins_df.columns:
-                print(self.logins_df["Resultat"].value_counts())
+                res = self.logins_df["Resultat"]
+                if isinstance(res.dtype, pd.CategoricalDtype):
+                    codes = res.cat.codes.to_numpy()
+                    counts = np.bincount(codes[codes >= 0], minlength=len(res.cat.categories))
+                    order = np.argsort(-counts)
+                    order = order[counts[order] > 0]
+                    print(pd.Series(counts[order], index=res.cat.categories[order], name="count"))
+                else:
+                    print(res.value_counts())
         else:
             print("Aucune donnée de login disponible ou fichier vide")
     
@@ -159,10 +219,18 @@ class CyberSecurityDataExplorer:
             print("Aucune donnée valide pour les types d'attaque")
             return
         
-        counts_type = valid_data["TypeAttaque"].value_counts().sort_values(ascending=False)
-        
+        # Count through the integer category codes instead of hashing strings
+        type_col = valid_data["TypeAttaque"]
+        if not isinstance(type_col.dtype, pd.CategoricalDtype):
+            type_col = type_col.astype("category")
+        codes = type_col.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(type_col.cat.categories))
+        order = np.argsort(-counts)
+        order = order[counts[order] > 0]
+        labels = type_col.cat.categories.to_numpy()[order]
+
         plt.figure(figsize=(10, 6))
-        counts_type.plot(kind="bar")
+        plt.bar(labels, counts[order])
         plt.title("Incidents par type d'attaque")
         plt.xlabel("Type d'attaque")
         plt.ylabel("Nombre d'incidents")
@@ -190,9 +258,14 @@ class CyberSecurityDataExplorer:
             print("Aucune donnée valide pour l'impact par secteur")
             return
         
-        impact_secteur = (valid_data.groupby("Secteur")["ImpactAriary"]
-                         .median()
-                         .sort_values(ascending=False))
+        grouped = valid_data.groupby("Secteur", observed=True)["ImpactAriary"]
+        try:
+            # numba groupby kernels skip the pandas sort preamble
+            impact_secteur = grouped.agg("median", engine="numba",
+                                         engine_kwargs={"parallel": True})
+        except (ImportError, NotImplementedError, TypeError):
+            impact_secteur = grouped.median()
+        impact_secteur = impact_secteur.sort_values(ascending=False)
         
         plt.figure(figsize=(10, 6))
         impact_secteur.plot(kind="bar")
@@ -217,10 +290,14 @@ class CyberSecurityDataExplorer:
             print("Aucune donnée valide pour les tentatives de connexion")
             return
         
-        log_day = valid_data.set_index("DateHeure").resample("D").size()
-        
+        # O(N) histogram on integer day bins instead of resample/groupby
+        dt = valid_data["DateHeure"].to_numpy("datetime64[D]")
+        day0 = dt.min()
+        counts = np.bincount((dt - day0).astype("int64"))
+        days = day0 + np.arange(len(counts)).astype("timedelta64[D]")
+
         plt.figure(figsize=(12, 6))
-        log_day.plot()
+        plt.plot(days, counts)
         plt.title("Volume de tentatives de connexion par jour")
         plt.xlabel("Date")
         plt.ylabel("Nombre de tentatives")
@@ -234,19 +311,32 @@ class CyberSecurityDataExplorer:
             print("Données de login non disponibles ou colonne Resultat manquante")
             return 0.0
         
-        # Filter out unknown/invalid results
-        valid_data = self.logins_df[
-            self.logins_df["Resultat"].notna() & 
-            (self.logins_df["Resultat"] != "unknown")
-        ]
-        
-        if valid_data.empty:
-            print("Aucune donnée valide pour calculer le taux d'échec")
-            return 0.0
-        
-        failure_rate = (valid_data["Resultat"] == "échec").mean()
+        res = self.logins_df["Resultat"]
+        if isinstance(res.dtype, pd.CategoricalDtype):
+            # Compare integer category codes: no string comparison per row
+            cats = res.cat.categories
+            codes = res.cat.codes.to_numpy()
+            valid = codes >= 0
+            if "unknown" in cats:
+                valid &= codes != cats.get_loc("unknown")
+            n_valid = int(valid.sum())
+            if n_valid == 0:
+                print("Aucune donnée valide pour calculer le taux d'échec")
+                return 0.0
+            if "échec" in cats:
+                failure_rate = (codes[valid] == cats.get_loc("échec")).mean()
+            else:
+                failure_rate = 0.0
+        else:
+            valid_mask = res.notna() & (res != "unknown")
+            n_valid = int(valid_mask.sum())
+            if n_valid == 0:
+                print("Aucune donnée valide pour calculer le taux d'échec")
+                return 0.0
+            failure_rate = (res[valid_mask] == "échec").mean()
+
         print(f"\nTaux d'échec global des connexions: {failure_rate:.2%}")
-        print(f"Basé sur {len(valid_data)} tentatives valides")
+        print(f"Basé sur {n_valid} tentatives valides")
         return failure_rate
     
     def run_complete_analysis(self) -> None:
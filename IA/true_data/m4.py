@@ -5,9 +5,45 @@ Provides detailed cluster analysis and characterization.
 Fixed to handle empty rows and missing files.
 """
 
+import numpy as np
 import pandas as pd
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba optionnel : repli boucle Python
+    njit = None
+    prange = range
+
+
+def _group_stats(values, starts, means, medians):
+    """Moyenne et médiane par groupe sur une matrice triée par cluster.
+
+    `starts` contient les bornes de chaque groupe dans `values` (lignes déjà
+    triées par code de cluster) ; une seule passe parallèle remplit les deux
+    matrices de sortie.
+    """
+    n_groups = starts.size - 1
+    n_cols = values.shape[1]
+    for g in prange(n_groups):
+        a = starts[g]
+        b = starts[g + 1]
+        for j in range(n_cols):
+            col = np.sort(values[a:b, j].copy())
+            total = 0.0
+            for i in range(col.size):
+                total += col[i]
+            means[g, j] = total / col.size
+            mid = col.size // 2
+            if col.size % 2 == 1:
+                medians[g, j] = col[mid]
+            else:
+                medians[g, j] = 0.5 * (col[mid - 1] + col[mid])
+
+
+if njit is not None:
+    _group_stats = njit(parallel=True, cache=True)(_group_stats)
 
 
 class SegmentProfiler:
@@ -22,6 +58,16 @@ class SegmentProfiler:
         """Load enterprise and user segment data with error handling."""
         def safe_load_csv(filepath):
             try:
+                # Le sidecar parquet écrit par m3 évite de re-parser le CSV
+                parquet_path = filepath.with_suffix(".parquet")
+                if parquet_path.exists() and (not filepath.exists()
+                                              or parquet_path.stat().st_mtime >= filepath.stat().st_mtime):
+                    df = pd.read_parquet(parquet_path)
+                    # m3 conserve les clés de groupby en index ; le profilage
+                    # attend des colonnes à plat
+                    if not isinstance(df.index, pd.RangeIndex):
+                        df = df.reset_index()
+                    return df if not df.empty else pd.DataFrame()
                 if filepath.exists():
                     df = pd.read_csv(filepath, skip_blank_lines=True).dropna(how='all')
                     return df if not df.empty else pd.DataFrame()
@@ -38,20 +84,22 @@ class SegmentProfiler:
         print(f"Chargé: {len(enterprises)} entreprises, {len(users)} utilisateurs")
         return enterprises, users
     
-    def analyze_enterprise_cluster(self, df: pd.DataFrame, cluster_id: int) -> Dict[str, Any]:
+    def analyze_enterprise_cluster(self, df: pd.DataFrame, cluster_id: int,
+                                   top_sectors: Dict[Any, Dict[str, int]] = None) -> Dict[str, Any]:
         """Analyze a specific enterprise cluster."""
         if df.empty or "cluster_esn" not in df.columns:
             return {"error": "No enterprise cluster data available"}
-        
+
         cluster_data = df[df["cluster_esn"] == cluster_id]
-        
+
         if cluster_data.empty:
             return {"error": f"No data found for cluster {cluster_id}"}
-        
+
         analysis = {
             "cluster_id": cluster_id,
             "size": len(cluster_data),
-            "dominant_sectors": self._get_top_values(cluster_data, "secteur", 3),
+            "dominant_sectors": (top_sectors.get(cluster_id, {"N/A": 0}) if top_sectors is not None
+                                 else self._get_top_values(cluster_data, "secteur", 3)),
             "median_size": self._safe_median(cluster_data, "taille"),
             "median_incident_freq": self._safe_median(cluster_data, "freq_incidents"),
             "avg_impact": self._safe_mean(cluster_data, "impact_moy"),
@@ -61,21 +109,25 @@ class SegmentProfiler:
         
         return analysis
     
-    def analyze_user_cluster(self, df: pd.DataFrame, cluster_id: int) -> Dict[str, Any]:
+    def analyze_user_cluster(self, df: pd.DataFrame, cluster_id: int,
+                             top_roles: Dict[Any, Dict[str, int]] = None,
+                             top_departments: Dict[Any, Dict[str, int]] = None) -> Dict[str, Any]:
         """Analyze a specific user cluster."""
         if df.empty or "cluster_risque" not in df.columns:
             return {"error": "No user cluster data available"}
-        
+
         cluster_data = df[df["cluster_risque"] == cluster_id]
-        
+
         if cluster_data.empty:
             return {"error": f"No data found for cluster {cluster_id}"}
-        
+
         analysis = {
             "cluster_id": cluster_id,
             "size": len(cluster_data),
-            "dominant_roles": self._get_top_values(cluster_data, "Role", 3),
-            "dominant_departments": self._get_top_values(cluster_data, "Departement", 3),
+            "dominant_roles": (top_roles.get(cluster_id, {"N/A": 0}) if top_roles is not None
+                               else self._get_top_values(cluster_data, "Role", 3)),
+            "dominant_departments": (top_departments.get(cluster_id, {"N/A": 0}) if top_departments is not None
+                                     else self._get_top_values(cluster_data, "Departement", 3)),
             "median_failures": self._safe_median(cluster_data, "nb_echecs"),
             "avg_failure_ratio": self._safe_mean(cluster_data, "ratio_echec"),
             "avg_countries": self._safe_mean(cluster_data, "nb_pays"),
@@ -84,6 +136,50 @@ class SegmentProfiler:
         
         return analysis
     
+    def _cluster_stats(self, df: pd.DataFrame, cluster_col: str,
+                       spec: Dict[str, Tuple[str, str]]) -> pd.DataFrame:
+        """Compute all per-cluster means/medians with one sort + one numba pass.
+
+        `spec` maps output names to (column, "mean"|"median"). Rows are sorted
+        once by cluster code, group bounds come from searchsorted, and the
+        kernel fills every statistic without per-cluster pandas dispatch.
+        """
+        spec = {name: s for name, s in spec.items() if s[0] in df.columns}
+        valid = df[df[cluster_col].notna()]
+        codes, cluster_ids = pd.factorize(valid[cluster_col], sort=True)
+        if len(cluster_ids) == 0:
+            return pd.DataFrame()
+
+        cols = list(dict.fromkeys(col for col, _ in spec.values()))
+        order = np.argsort(codes, kind="stable")
+        values = np.ascontiguousarray(valid[cols].to_numpy(np.float32)[order])
+        starts = np.searchsorted(codes[order], np.arange(len(cluster_ids) + 1))
+
+        means = np.empty((len(cluster_ids), len(cols)), np.float32)
+        medians = np.empty_like(means)
+        _group_stats(values, starts, means, medians)
+
+        out = pd.DataFrame({"size": np.diff(starts)}, index=cluster_ids)
+        for name, (col, how) in spec.items():
+            source = medians if how == "median" else means
+            # float64 en sortie pour un affichage arrondi propre
+            out[name] = source[:, cols.index(col)].astype(np.float64)
+        return out
+
+    def _top_values_by_cluster(self, df: pd.DataFrame, cluster_col: str, column: str,
+                               n: int = 3) -> Dict[Any, Dict[str, int]]:
+        """Precompute the top n values of a column for every cluster in one scan."""
+        if column not in df.columns:
+            return {}
+
+        # value_counts sur une colonne catégorielle inclut les catégories à
+        # zéro occurrence ; on les écarte comme le faisait le dtype objet
+        out: Dict[Any, Dict[str, int]] = {}
+        for cluster_id, values in df.groupby(cluster_col)[column]:
+            counts = values.value_counts()
+            out[cluster_id] = counts[counts > 0].head(n).to_dict()
+        return out
+
     def _get_top_values(self, df: pd.DataFrame, column: str, n: int = 3) -> Dict[str, int]:
         """Get top n values from a column as dictionary."""
         if column not in df.columns or df[column].empty:
@@ -136,26 +232,27 @@ class SegmentProfiler:
             print("Colonne cluster_esn non trouvée dans les données d'entreprise")
             return
         
-        clusters = sorted(df["cluster_esn"].dropna().unique())
-        
-        if not clusters:
+        # Un seul scan de la colonne secteur pour tous les clusters
+        top_sectors = self._top_values_by_cluster(df, "cluster_esn", "secteur", 3)
+
+        # Toutes les statistiques par cluster en un seul tri + noyau numba au
+        # lieu de re-filtrer le DataFrame complet pour chaque cluster
+        agg = self._cluster_stats(df, "cluster_esn", {
+            "median_size": ("taille", "median"),
+            "median_incident_freq": ("freq_incidents", "median"),
+            "avg_impact": ("impact_moy", "mean"),
+            "avg_downtime": ("indispo_moy", "mean"),
+            "avg_attack_diversity": ("nb_types", "mean"),
+        })
+
+        if agg.empty:
             print("Aucun cluster d'entreprise trouvé")
             return
-        
-        for cluster_id in clusters:
-            analysis = self.analyze_enterprise_cluster(df, cluster_id)
-            
-            if "error" in analysis:
-                print(f"\n{analysis['error']}")
-                continue
-            
-            print(f"\nCluster {analysis['cluster_id']} — {analysis['size']} entreprises")
-            print("Secteurs dominants:", analysis["dominant_sectors"])
-            print("Taille médiane:", analysis["median_size"])
-            print("Fréq incidents médian:", analysis["median_incident_freq"])
-            print("Impact moyen:", analysis["avg_impact"])
-            print("Indispo moyenne:", analysis["avg_downtime"])
-            print("Diversité attaques (moy):", analysis["avg_attack_diversity"])
+
+        # Un seul dump formaté : un flush stdout au lieu de 7 par cluster
+        agg["dominant_sectors"] = [top_sectors.get(cid, {"N/A": 0}) for cid in agg.index]
+        agg.index.name = "cluster"
+        print(agg.round(2).to_string())
     
     def profile_users(self, df: pd.DataFrame) -> None:
         """Profile all user clusters."""
@@ -169,26 +266,27 @@ class SegmentProfiler:
             print("Colonne cluster_risque non trouvée dans les données d'utilisateur")
             return
         
-        clusters = sorted(df["cluster_risque"].dropna().unique())
-        
-        if not clusters:
+        # Un seul scan des colonnes Role/Departement pour tous les clusters
+        top_roles = self._top_values_by_cluster(df, "cluster_risque", "Role", 3)
+        top_departments = self._top_values_by_cluster(df, "cluster_risque", "Departement", 3)
+
+        # Toutes les statistiques par cluster en un seul tri + noyau numba
+        agg = self._cluster_stats(df, "cluster_risque", {
+            "median_failures": ("nb_echecs", "median"),
+            "avg_failure_ratio": ("ratio_echec", "mean"),
+            "avg_countries": ("nb_pays", "mean"),
+            "avg_ips": ("nb_ip", "mean"),
+        })
+
+        if agg.empty:
             print("Aucun cluster d'utilisateur trouvé")
             return
-        
-        for cluster_id in clusters:
-            analysis = self.analyze_user_cluster(df, cluster_id)
-            
-            if "error" in analysis:
-                print(f"\n{analysis['error']}")
-                continue
-            
-            print(f"\nCluster {analysis['cluster_id']} — {analysis['size']} utilisateurs")
-            print("Rôles dominants:", analysis["dominant_roles"])
-            print("Départements dominants:", analysis["dominant_departments"])
-            print("Nb échecs médian:", analysis["median_failures"])
-            print("Ratio échec moyen:", analysis["avg_failure_ratio"])
-            print("Pays distincts moyen:", analysis["avg_countries"])
-            print("IP distinctes moyen:", analysis["avg_ips"])
+
+        # Un seul dump formaté : un flush stdout au lieu de 7 par cluster
+        agg["dominant_roles"] = [top_roles.get(cid, {"N/A": 0}) for cid in agg.index]
+        agg["dominant_departments"] = [top_departments.get(cid, {"N/A": 0}) for cid in agg.index]
+        agg.index.name = "cluster"
+        print(agg.round(2).to_string())
     
     def generate_cluster_summary(self, df: pd.DataFrame, cluster_col: str, cluster_type: str) -> pd.DataFrame:
         """Generate a summary DataFrame for all clusters."""
@@ -5,52 +5,244 @@ Generates key performance indicators and trend visualizations.
 Fixed to handle empty rows in CSV files.
 """
 
+import joblib
 import pandas as pd
 import numpy as np
+import polars as pl
+import pyarrow.parquet as pq
+import matplotlib
+matplotlib.use("Agg")  # rendu hors écran : pas d'init GUI pour les exports batch
 import matplotlib.pyplot as plt
 from pathlib import Path
 from typing import Tuple, Optional
 from datetime import datetime
 
+try:
+    from numba import njit, prange
+except ImportError:  # repli séquentiel pur Python si numba est absent
+    njit = None
+    prange = range
+
+
+def _monthly_fail_stats(ts_ns, fail, bounds_ns, sums, counts):
+    """Accumulate per-month failure sums and counts on sorted timestamps.
+
+    Chaque mois est une tranche contiguë délimitée par recherche binaire,
+    donc la boucle externe se parallélise sans écriture concurrente.
+    """
+    for m in prange(bounds_ns.size - 1):
+        s = np.searchsorted(ts_ns, bounds_ns[m])
+        e = np.searchsorted(ts_ns, bounds_ns[m + 1])
+        acc = 0
+        for i in range(s, e):
+            acc += fail[i]
+        sums[m] = acc
+        counts[m] = e - s
+
+
+if njit is not None:
+    _monthly_fail_stats = njit(parallel=True, cache=True)(_monthly_fail_stats)
+
+
+def _resample_chunk(groups, freq, aggs):
+    """Resample a chunk of (key, frame) pairs in-process for joblib workers."""
+    parts = []
+    for key, frame in groups:
+        resampled = frame.set_index("Date").resample(freq).agg(aggs)
+        resampled["_group"] = key
+        parts.append(resampled)
+    return pd.concat(parts)
+
 
 class CyberSecurityKPIs:
     """Calculates and visualizes key performance indicators for cybersecurity metrics."""
-    
+
+    # Seules ces colonnes sont consommées par les KPI : la projection à la
+    # lecture évite de matérialiser le reste du fichier
+    _INCIDENT_COLS = ["Date", "ImpactAriary", "Secteur", "DateResolution"]
+    _LOGIN_COLS = ["DateHeure", "Resultat", "Utilisateur", "IPSource"]
+
     def __init__(self, incidents_csv: str = "incidents.csv", logins_csv: str = "logins.csv"):
         self.incidents_path = Path(incidents_csv)
         self.logins_path = Path(logins_csv)
         self.incidents_df = None
         self.logins_df = None
-        
+        # Mémoïsation des séries KPI, invalidée à chaque load_data
+        self._cache = {}
+        # Vrai quand logins_df est trié par DateHeure (posé par load_data)
+        self._sorted = False
+        # Figure unique réutilisée par tous les tracés (allouée au premier usage)
+        self._fig = None
+        self._ax = None
+
+    @staticmethod
+    def _top_counts(series: pd.Series, top_n: Optional[int] = None) -> pd.Series:
+        """value_counts via factorize + bincount : comptage entier contigu,
+        sans table de hachage de chaînes ; argpartition pour le top-n."""
+        codes, uniques = pd.factorize(series, sort=False)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        if top_n is None or top_n >= counts.size:
+            idx = np.argsort(-counts, kind="stable")
+        else:
+            idx = np.argpartition(-counts, top_n - 1)[:top_n]
+            idx = idx[np.argsort(-counts[idx], kind="stable")]
+        return pd.Series(counts[idx], index=np.asarray(uniques)[idx])
+
+    def _get_axis(self, figsize: Tuple[int, int] = (12, 6)):
+        """Return the shared Axes, cleared and resized for the next chart."""
+        if self._fig is None:
+            self._fig, self._ax = plt.subplots(figsize=figsize)
+        else:
+            self._fig.set_size_inches(*figsize)
+            self._ax.cla()
+        return self._ax
+
+    def _save(self, save_path: str) -> None:
+        """Write the current figure: vector SVG by default, low-res PNG otherwise."""
+        if str(save_path).lower().endswith(".svg"):
+            # Sortie vectorielle : aucun travail de rasterisation Agg ;
+            # metadata Date à None pour une sortie déterministe
+            self._fig.savefig(save_path, bbox_inches='tight', metadata={"Date": None})
+        else:
+            self._fig.savefig(save_path, dpi=100, bbox_inches='tight')
+        print(f"Graphique sauvegardé: {save_path}")
+
+    @staticmethod
+    def _parallel_resample(df: pd.DataFrame, by: str, freq: str, aggs: dict,
+                           chunk_size: int = 100, n_jobs: int = -1) -> pd.DataFrame:
+        """Resample df per `by` group across joblib workers, chunk by chunk.
+
+        Le resample par entité de pandas est séquentiel ; en répartissant des
+        paquets de groupes entre processus on garde chaque worker occupé sans
+        payer un envoi inter-processus par groupe. Prévu pour les ventilations
+        par Entreprise/Secteur du résumé exécutif.
+        """
+        groups = list(df.groupby(by, observed=True))
+        if not groups:
+            return pd.DataFrame()
+        chunks = [groups[i:i + chunk_size] for i in range(0, len(groups), chunk_size)]
+        results = joblib.Parallel(n_jobs=n_jobs)(
+            joblib.delayed(_resample_chunk)(chunk, freq, aggs) for chunk in chunks
+        )
+        out = pd.concat(results)
+        return out.rename(columns={"_group": by})
+
+    @staticmethod
+    def _fresh_parquet(csv_path: Path) -> Optional[Path]:
+        """Return the parquet sidecar if it is at least as fresh as the CSV."""
+        pq_path = csv_path.with_suffix(".parquet")
+        if pq_path.exists() and (not csv_path.exists()
+                                 or pq_path.stat().st_mtime >= csv_path.stat().st_mtime):
+            return pq_path
+        return None
+
+    @staticmethod
+    def _read_parquet_projected(pq_path: Path, wanted: list) -> pd.DataFrame:
+        """Read only the wanted columns from a parquet sidecar (row groups skipped)."""
+        available = pq.read_schema(pq_path).names
+        cols = [c for c in wanted if c in available]
+        return pd.read_parquet(pq_path, engine="pyarrow", columns=cols or None)
+
+    def _load_incidents(self) -> pd.DataFrame:
+        pq_path = self._fresh_parquet(self.incidents_path)
+        if pq_path is not None:
+            return self._read_parquet_projected(pq_path, self._INCIDENT_COLS)
+
+        # Tokenizer PyArrow multi-thread ; les lignes vides sont gérées
+        # nativement puis filtrées par le dropna(how='all')
+        df = pd.read_csv(
+            self.incidents_path,
+            engine="pyarrow",
+            parse_dates=["Date"],
+        ).dropna(how='all')
+
+        if not df.empty:
+            df = df.dropna(subset=["Date"])
+            # Fill missing impact values
+            if "ImpactAriary" in df.columns:
+                df["ImpactAriary"] = df["ImpactAriary"].fillna(0)
+            # Sidecar écrit en pleine largeur (cache partagé avec m3/m4) ;
+            # la projection ne s'applique qu'au DataFrame retourné
+            df.to_parquet(self.incidents_path.with_suffix(".parquet"), compression="snappy")
+            df = df[[c for c in self._INCIDENT_COLS if c in df.columns]]
+        return df
+
+    def _load_logins(self) -> pd.DataFrame:
+        pq_path = self._fresh_parquet(self.logins_path)
+        if pq_path is not None:
+            return self._read_parquet_projected(pq_path, self._LOGIN_COLS)
+
+        df = pd.read_csv(
+            self.logins_path,
+            engine="pyarrow",
+            parse_dates=["DateHeure"],
+        ).dropna(how='all')
+
+        if not df.empty:
+            df = df.dropna(subset=["DateHeure"])
+            # Standardize login results
+            if "Resultat" in df.columns:
+                df["Resultat"] = df["Resultat"].fillna("unknown").str.lower().str.strip()
+            df.to_parquet(self.logins_path.with_suffix(".parquet"), compression="snappy")
+            df = df[[c for c in self._LOGIN_COLS if c in df.columns]]
+        return df
+
     def load_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
-        """Load and prepare data for analysis, handling empty rows."""
+        """Load and prepare data, reading the parquet cache when it is fresh."""
+        self._cache.clear()
         try:
-            # Load with empty row handling
-            self.incidents_df = pd.read_csv(
-                self.incidents_path, 
-                parse_dates=["Date"], 
-                skip_blank_lines=True
-            ).dropna(how='all')
-            
-            self.logins_df = pd.read_csv(
-                self.logins_path, 
-                parse_dates=["DateHeure"], 
-                skip_blank_lines=True
-            ).dropna(how='all')
-            
-            # Clean critical columns
-            if not self.incidents_df.empty:
-                self.incidents_df = self.incidents_df.dropna(subset=["Date"])
-                # Fill missing impact values
-                if "ImpactAriary" in self.incidents_df.columns:
-                    self.incidents_df["ImpactAriary"] = self.incidents_df["ImpactAriary"].fillna(0)
-            
+            self.incidents_df = self._load_incidents()
+            self.logins_df = self._load_logins()
+
+            # Impact en float32 : précision largement suffisante pour un KPI
+            # d'affichage, bande passante mémoire divisée par deux (les sommes
+            # accumulent en float64)
+            if not self.incidents_df.empty and "ImpactAriary" in self.incidents_df.columns:
+                self.incidents_df["ImpactAriary"] = self.incidents_df["ImpactAriary"].astype(np.float32)
+
+            # Colonnes de chaînes à faible cardinalité en catégories : les
+            # comparaisons et nunique travaillent ensuite sur des codes int8
+            if not self.incidents_df.empty and "Secteur" in self.incidents_df.columns:
+                self.incidents_df["Secteur"] = self.incidents_df["Secteur"].astype("category")
             if not self.logins_df.empty:
-                self.logins_df = self.logins_df.dropna(subset=["DateHeure"])
-                # Standardize login results
-                if "Resultat" in self.logins_df.columns:
-                    self.logins_df["Resultat"] = self.logins_df["Resultat"].fillna("unknown").str.lower().str.strip()
-            
+                for col in ("Resultat", "Utilisateur", "IPSource"):
+                    if col in self.logins_df.columns:
+                        self.logins_df[col] = self.logins_df[col].astype("category")
+
+            # Colonnes texte restantes en chaînes Arrow (offsets + buffer
+            # contigu) plutôt qu'un objet Python par ligne ; no-op sous
+            # pandas >= 3 où c'est déjà le dtype chaîne par défaut
+            for df in (self.incidents_df, self.logins_df):
+                for col in df.columns[df.dtypes == object]:
+                    df[col] = df[col].astype("string[pyarrow]")
+
+            # Logins triés par horodatage : les filtres de période deviennent
+            # des tranches contiguës (recherche binaire) au lieu de masques
+            self._sorted = False
+            if not self.logins_df.empty and "DateHeure" in self.logins_df.columns:
+                if not self.logins_df["DateHeure"].is_monotonic_increasing:
+                    self.logins_df = self.logins_df.sort_values(
+                        "DateHeure", kind="mergesort").reset_index(drop=True)
+                self._sorted = True
+
+            # Indicateur d'échec calculé une seule fois et réutilisé par tous
+            # les KPI ; mis en cache dans un sidecar .npy relu en mmap (seules
+            # les pages réellement touchées sont chargées). L'ordre des lignes
+            # est déterministe (tri stable ci-dessus), donc le sidecar reste
+            # aligné d'une exécution à l'autre.
+            if not self.logins_df.empty and "Resultat" in self.logins_df.columns:
+                isfail_path = self.logins_path.with_suffix(".isfail.npy")
+                is_fail = None
+                if isfail_path.exists() and (not self.logins_path.exists()
+                        or isfail_path.stat().st_mtime >= self.logins_path.stat().st_mtime):
+                    cached = np.load(isfail_path, mmap_mode="r")
+                    if len(cached) == len(self.logins_df):
+                        is_fail = cached
+                if is_fail is None:
+                    is_fail = (self.logins_df["Resultat"] == "échec").to_numpy()
+                    np.save(isfail_path, is_fail)
+                self.logins_df["_is_fail"] = np.asarray(is_fail)
+
             print(f"Données chargées: {len(self.incidents_df)} incidents, {len(self.logins_df)} logins")
             return self.incidents_df, self.logins_df
             
@@ -65,131 +257,233 @@ class CyberSecurityKPIs:
             self.logins_df = pd.DataFrame()
             return self.incidents_df, self.logins_df
     
+    def _incident_date_valid(self) -> np.ndarray:
+        """Boolean mask of incidents with a parsed Date, computed once per load.
+
+        Chaque notna() alloue un tableau booléen pleine longueur ; le masque
+        partagé évite de le recalculer à chaque KPI de la même analyse.
+        """
+        if "inc_valid_date" not in self._cache:
+            self._cache["inc_valid_date"] = self.incidents_df["Date"].notna().to_numpy()
+        return self._cache["inc_valid_date"]
+
+    def _login_dt_valid(self) -> np.ndarray:
+        """Boolean mask of logins with a parsed DateHeure, computed once per load."""
+        if "log_valid_dt" not in self._cache:
+            self._cache["log_valid_dt"] = self.logins_df["DateHeure"].notna().to_numpy()
+        return self._cache["log_valid_dt"]
+
+    def _collect_incident_kpis(self) -> Tuple[pd.Series, pd.Series]:
+        """Compute the monthly count and quarterly impact in one Polars collect.
+
+        Both aggregations share the same lazy source, so collect_all factorise
+        la passe sur les données ; les index sont ramenés en fin de mois /
+        trimestre pour rester alignés sur l'ancien resample pandas.
+        """
+        if "incident_kpis" in self._cache:
+            return self._cache["incident_kpis"]
+
+        monthly = pd.Series([], dtype=int, name="nb_incidents")
+        quarterly = pd.Series([], dtype=float, name="ImpactAriary")
+
+        valid_data = self.incidents_df[self._incident_date_valid()]
+        if valid_data.empty:
+            return monthly, quarterly
+
+        has_impact = "ImpactAriary" in valid_data.columns
+        cols = ["Date", "ImpactAriary"] if has_impact else ["Date"]
+        lf = pl.from_pandas(valid_data[cols]).lazy().sort("Date")
+
+        # Une seule agrégation mensuelle porte le comptage ET l'impact ; le
+        # trimestriel se déduit en resamplant la petite table mensuelle
+        agg_exprs = [pl.len().alias("nb_incidents")]
+        if has_impact:
+            agg_exprs.append(
+                pl.col("ImpactAriary")
+                  .filter(pl.col("ImpactAriary").is_not_null() & (pl.col("ImpactAriary") >= 0))
+                  .cast(pl.Float64)
+                  .sum()
+                  .alias("impact")
+            )
+        monthly_tbl = (lf.group_by_dynamic("Date", every="1mo")
+                         .agg(agg_exprs)
+                         .collect()
+                         .to_pandas()
+                         .set_index("Date"))
+        monthly_tbl.index = monthly_tbl.index + pd.offsets.MonthEnd(0)
+
+        # group_by_dynamic saute les fenêtres vides ; on réaligne sur un
+        # calendrier mensuel complet comme le faisait resample("ME").size()
+        full_range = pd.date_range(monthly_tbl.index[0], monthly_tbl.index[-1], freq="ME")
+        if len(full_range) != len(monthly_tbl):
+            monthly_tbl = monthly_tbl.reindex(full_range, fill_value=0)
+
+        monthly = monthly_tbl["nb_incidents"]
+        if has_impact:
+            quarterly = monthly_tbl["impact"].resample("QE").sum().rename("ImpactAriary")
+        self._cache["incident_kpis"] = (monthly, quarterly)
+        return monthly, quarterly
+
     def calculate_monthly_incidents(self) -> pd.Series:
         """Calculate incidents per month."""
-        if (self.incidents_df is None or self.incidents_df.empty or 
+        if (self.incidents_df is None or self.incidents_df.empty or
             "Date" not in self.incidents_df.columns):
             print("Aucune donnée d'incident disponible")
             return pd.Series([], dtype=int, name="nb_incidents")
-        
-        # Filter valid dates
-        valid_data = self.incidents_df[self.incidents_df["Date"].notna()]
-        if valid_data.empty:
-            return pd.Series([], dtype=int, name="nb_incidents")
-        
-        return valid_data.set_index("Date").resample("ME").size().rename("nb_incidents")
-    
+
+        return self._collect_incident_kpis()[0]
+
     def calculate_quarterly_impact(self) -> pd.Series:
         """Calculate total financial impact per quarter."""
-        if (self.incidents_df is None or self.incidents_df.empty or 
-            "Date" not in self.incidents_df.columns or 
+        if (self.incidents_df is None or self.incidents_df.empty or
+            "Date" not in self.incidents_df.columns or
             "ImpactAriary" not in self.incidents_df.columns):
             print("Données d'impact non disponibles")
             return pd.Series([], dtype=float, name="impact")
-        
-        # Filter valid data
-        valid_data = self.incidents_df[
-            self.incidents_df["Date"].notna() & 
-            self.incidents_df["ImpactAriary"].notna() &
-            (self.incidents_df["ImpactAriary"] >= 0)
-        ]
-        
-        if valid_data.empty:
-            return pd.Series([], dtype=float, name="impact")
-        
-        return valid_data.set_index("Date").resample("QE")["ImpactAriary"].sum()
+
+        return self._collect_incident_kpis()[1]
     
+    def _streaming_failure_rate(self) -> pd.Series:
+        """Monthly failure rate via the Polars streaming engine.
+
+        Le fichier est balayé par morceaux sans jamais être matérialisé en
+        entier : la mémoire de pointe est O(chunk) au lieu de O(N), quelle
+        que soit la taille du journal de logins.
+        """
+        if self.logins_path.exists():
+            lf = pl.scan_csv(self.logins_path, try_parse_dates=True)
+        else:
+            lf = pl.scan_parquet(self.logins_path.with_suffix(".parquet"))
+        monthly = (
+            lf.select("DateHeure", "Resultat")
+              .filter(pl.col("DateHeure").is_not_null() & pl.col("Resultat").is_not_null())
+              .with_columns(res=pl.col("Resultat").str.to_lowercase().str.strip_chars())
+              .filter(pl.col("res") != "unknown")
+              .with_columns(fail=(pl.col("res") == "échec"))
+              .sort("DateHeure")
+              .group_by_dynamic("DateHeure", every="1mo")
+              .agg(pl.col("fail").mean())
+              .collect(engine="streaming")
+              .to_pandas()
+              .set_index("DateHeure")["fail"]
+              .rename("failure_rate")
+        )
+        monthly.index = monthly.index + pd.offsets.MonthEnd(0)
+        return monthly
+
     def calculate_monthly_failure_rate(self) -> pd.Series:
         """Calculate monthly login failure rates."""
-        if (self.logins_df is None or self.logins_df.empty or 
-            "DateHeure" not in self.logins_df.columns or 
+        if "monthly_failure_rate" in self._cache:
+            return self._cache["monthly_failure_rate"]
+
+        if (self.logins_df is None or self.logins_df.empty or
+            "DateHeure" not in self.logins_df.columns or
             "Resultat" not in self.logins_df.columns):
             print("Données de login non disponibles")
             return pd.Series([], dtype=float, name="failure_rate")
-        
-        # Filter valid data
-        valid_data = self.logins_df[
-            self.logins_df["DateHeure"].notna() & 
-            self.logins_df["Resultat"].notna() &
-            (self.logins_df["Resultat"] != "unknown")
-        ]
-        
-        if valid_data.empty:
-            return pd.Series([], dtype=float, name="failure_rate")
-        
-        return (valid_data.set_index("DateHeure")
-                .resample("ME")["Resultat"]
-                .apply(lambda s: (s == "échec").mean()))
+
+        try:
+            result = self._streaming_failure_rate()
+        except Exception as e:
+            print(f"Moteur streaming indisponible ({e}), repli sur le noyau local")
+            # Réutilise les tableaux triés déjà mis en cache par
+            # compare_periods : aucun filtrage supplémentaire du DataFrame
+            dates, cumfail = self._failure_arrays()
+            if dates is None:
+                return pd.Series([], dtype=float, name="failure_rate")
+            fail = np.diff(cumfail, prepend=0).astype(np.uint8)
+
+            first = dates[0].astype("datetime64[M]")
+            last = dates[-1].astype("datetime64[M]")
+            months = np.arange(first, last + 1)
+            bounds_ns = np.arange(first, last + 2).astype("datetime64[ns]").view(np.int64)
+            sums = np.zeros(months.size, dtype=np.int64)
+            counts = np.zeros(months.size, dtype=np.int64)
+            # normalisation en ns : le parquet peut restituer du datetime64[us]
+            ts_ns = dates.astype("datetime64[ns]").view(np.int64)
+            _monthly_fail_stats(ts_ns, fail, bounds_ns, sums, counts)
+
+            rate = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+            index = pd.DatetimeIndex(months.astype("datetime64[ns]")) + pd.offsets.MonthEnd(0)
+            result = pd.Series(rate, index=index, name="failure_rate")
+        self._cache["monthly_failure_rate"] = result
+        return result
     
-    def plot_monthly_incidents(self, save_path: Optional[str] = "incidents_par_mois.png") -> None:
+    def plot_monthly_incidents(self, save_path: Optional[str] = "incidents_par_mois.svg",
+                               monthly_incidents: Optional[pd.Series] = None) -> None:
         """Plot monthly incidents trend."""
-        monthly_incidents = self.calculate_monthly_incidents()
+        if monthly_incidents is None:
+            monthly_incidents = self.calculate_monthly_incidents()
         
         if monthly_incidents.empty:
             print("Pas de données pour tracer les incidents mensuels")
             return
         
-        plt.figure(figsize=(12, 6))
-        monthly_incidents.plot(marker='o', linewidth=2)
-        plt.title("Incidents par mois", fontsize=14, fontweight='bold')
-        plt.xlabel("Mois")
-        plt.ylabel("Nombre d'incidents")
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        
+        ax = self._get_axis(figsize=(12, 6))
+        monthly_incidents.plot(ax=ax, marker='o', linewidth=2)
+        ax.set_title("Incidents par mois", fontsize=14, fontweight='bold')
+        ax.set_xlabel("Mois")
+        ax.set_ylabel("Nombre d'incidents")
+        ax.grid(True, alpha=0.3)
+
+        # Une seule passe de layout : bbox_inches='tight' à la sauvegarde,
+        # tight_layout seulement pour le rendu en mémoire
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Graphique sauvegardé: {save_path}")
-        
-        plt.show()
+            self._save(save_path)
+        else:
+            self._fig.tight_layout()
     
-    def plot_quarterly_impact(self, save_path: Optional[str] = "impact_trimestriel.png") -> None:
+    def plot_quarterly_impact(self, save_path: Optional[str] = "impact_trimestriel.svg",
+                              quarterly_impact: Optional[pd.Series] = None) -> None:
         """Plot quarterly financial impact trend."""
-        quarterly_impact = self.calculate_quarterly_impact()
+        if quarterly_impact is None:
+            quarterly_impact = self.calculate_quarterly_impact()
         
         if quarterly_impact.empty:
             print("Pas de données pour tracer l'impact trimestriel")
             return
         
-        plt.figure(figsize=(12, 6))
-        quarterly_impact.plot(kind='bar', color='red', alpha=0.7)
-        plt.title("Impact financier total par trimestre", fontsize=14, fontweight='bold')
-        plt.xlabel("Trimestre")
-        plt.ylabel("Impact (MGA)")
-        plt.xticks(rotation=45)
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        
+        ax = self._get_axis(figsize=(12, 6))
+        quarterly_impact.plot(ax=ax, kind='bar', color='red', alpha=0.7)
+        ax.set_title("Impact financier total par trimestre", fontsize=14, fontweight='bold')
+        ax.set_xlabel("Trimestre")
+        ax.set_ylabel("Impact (MGA)")
+        ax.tick_params(axis='x', rotation=45)
+        ax.grid(True, alpha=0.3)
+
+        # Une seule passe de layout : bbox_inches='tight' à la sauvegarde,
+        # tight_layout seulement pour le rendu en mémoire
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Graphique sauvegardé: {save_path}")
-        
-        plt.show()
+            self._save(save_path)
+        else:
+            self._fig.tight_layout()
     
-    def plot_monthly_failure_rate(self, save_path: Optional[str] = "taux_echec_mensuel.png") -> None:
+    def plot_monthly_failure_rate(self, save_path: Optional[str] = "taux_echec_mensuel.svg",
+                                  monthly_failure_rate: Optional[pd.Series] = None) -> None:
         """Plot monthly failure rate trend."""
-        monthly_failure_rate = self.calculate_monthly_failure_rate()
+        if monthly_failure_rate is None:
+            monthly_failure_rate = self.calculate_monthly_failure_rate()
         
         if monthly_failure_rate.empty:
             print("Pas de données pour tracer le taux d'échec mensuel")
             return
         
-        plt.figure(figsize=(12, 6))
-        monthly_failure_rate.plot(marker='s', linewidth=2, color='orange')
-        plt.title("Taux d'échec des connexions (mensuel)", fontsize=14, fontweight='bold')
-        plt.xlabel("Mois")
-        plt.ylabel("Taux d'échec")
-        plt.gca().yaxis.set_major_formatter(plt.FuncFormatter(lambda y, _: f'{y:.1%}'))
-        plt.grid(True, alpha=0.3)
-        plt.tight_layout()
-        
+        ax = self._get_axis(figsize=(12, 6))
+        monthly_failure_rate.plot(ax=ax, marker='s', linewidth=2, color='orange')
+        ax.set_title("Taux d'échec des connexions (mensuel)", fontsize=14, fontweight='bold')
+        ax.set_xlabel("Mois")
+        ax.set_ylabel("Taux d'échec")
+        ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda y, _: f'{y:.1%}'))
+        ax.grid(True, alpha=0.3)
+
+        # Une seule passe de layout : bbox_inches='tight' à la sauvegarde,
+        # tight_layout seulement pour le rendu en mémoire
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Graphique sauvegardé: {save_path}")
-        
-        plt.show()
+            self._save(save_path)
+        else:
+            self._fig.tight_layout()
     
-    def plot_incident_severity_distribution(self, save_path: Optional[str] = "distribution_severite.png") -> None:
+    def plot_incident_severity_distribution(self, save_path: Optional[str] = "distribution_severite.svg") -> None:
         """Plot distribution of incident severity levels."""
         if (self.incidents_df is None or self.incidents_df.empty or 
             "Severite" not in self.incidents_df.columns):
@@ -201,22 +495,22 @@ class CyberSecurityKPIs:
             print("Aucune donnée de sévérité valide")
             return
         
-        severity_counts = severity_data["Severite"].value_counts()
+        severity_counts = self._top_counts(severity_data["Severite"])
         
-        plt.figure(figsize=(10, 6))
+        ax = self._get_axis(figsize=(10, 6))
         colors = ['#ff4444', '#ff8800', '#ffdd00', '#88dd00', '#0088dd']
-        severity_counts.plot(kind='pie', autopct='%1.1f%%', colors=colors[:len(severity_counts)])
-        plt.title("Distribution des incidents par niveau de sévérité", fontsize=14, fontweight='bold')
-        plt.ylabel("")  # Remove default ylabel for pie charts
-        plt.axis('equal')
-        
+        severity_counts.plot(ax=ax, kind='pie', autopct='%1.1f%%', colors=colors[:len(severity_counts)])
+        ax.set_title("Distribution des incidents par niveau de sévérité", fontsize=14, fontweight='bold')
+        ax.set_ylabel("")  # Remove default ylabel for pie charts
+        ax.axis('equal')
+
+        # tight_layout seulement pour le rendu en mémoire
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Graphique sauvegardé: {save_path}")
-        
-        plt.show()
+            self._save(save_path)
+        else:
+            self._fig.tight_layout()
     
-    def plot_top_attack_vectors(self, top_n: int = 10, save_path: Optional[str] = "top_vecteurs_attaque.png") -> None:
+    def plot_top_attack_vectors(self, top_n: int = 10, save_path: Optional[str] = "top_vecteurs_attaque.svg") -> None:
         """Plot top attack vectors."""
         if (self.incidents_df is None or self.incidents_df.empty or 
             "VecteurAttaque" not in self.incidents_df.columns):
@@ -228,58 +522,59 @@ class CyberSecurityKPIs:
             print("Aucune donnée de vecteur d'attaque valide")
             return
         
-        top_vectors = vector_data["VecteurAttaque"].value_counts().head(top_n)
-        
-        plt.figure(figsize=(12, 8))
-        top_vectors.plot(kind='barh', color='steelblue')
-        plt.title(f"Top {top_n} des vecteurs d'attaque", fontsize=14, fontweight='bold')
-        plt.xlabel("Nombre d'incidents")
-        plt.ylabel("Vecteur d'attaque")
-        plt.grid(axis='x', alpha=0.3)
-        plt.tight_layout()
+        top_vectors = self._top_counts(vector_data["VecteurAttaque"], top_n)
         
+        ax = self._get_axis(figsize=(12, 8))
+        top_vectors.plot(ax=ax, kind='barh', color='steelblue')
+        ax.set_title(f"Top {top_n} des vecteurs d'attaque", fontsize=14, fontweight='bold')
+        ax.set_xlabel("Nombre d'incidents")
+        ax.set_ylabel("Vecteur d'attaque")
+        ax.grid(axis='x', alpha=0.3)
+
+        # Une seule passe de layout : bbox_inches='tight' à la sauvegarde,
+        # tight_layout seulement pour le rendu en mémoire
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"Graphique sauvegardé: {save_path}")
-        
-        plt.show()
+            self._save(save_path)
+        else:
+            self._fig.tight_layout()
     
     def calculate_mttr(self) -> dict:
-        """Calculate Mean Time To Resolution (MTTR)."""
-        if (self.incidents_df is None or self.incidents_df.empty or 
+        """Calculate Mean Time To Resolution (MTTR), memoized per load."""
+        if "mttr" not in self._cache:
+            self._cache["mttr"] = self._compute_mttr()
+        return self._cache["mttr"]
+
+    def _compute_mttr(self) -> dict:
+        if (self.incidents_df is None or self.incidents_df.empty or
             "Date" not in self.incidents_df.columns or 
             "DateResolution" not in self.incidents_df.columns):
             print("Données de résolution non disponibles pour MTTR")
             return {"error": "Missing resolution data"}
         
-        resolved_incidents = self.incidents_df[
-            self.incidents_df["Date"].notna() & 
-            self.incidents_df["DateResolution"].notna()
-        ].copy()
-        
-        if resolved_incidents.empty:
+        mask = (self._incident_date_valid() &
+                self.incidents_df["DateResolution"].notna().to_numpy())
+
+        if not mask.any():
             return {"error": "No resolved incidents found"}
-        
-        # Calculate resolution time
-        resolved_incidents["ResolutionTime"] = (
-            resolved_incidents["DateResolution"] - resolved_incidents["Date"]
-        ).dt.total_seconds() / 3600  # Convert to hours
-        
+
+        # Délai calculé en int64 ns : ni copie de DataFrame, ni accessor .dt
+        start = self.incidents_df["Date"].to_numpy("datetime64[ns]")[mask].view(np.int64)
+        end = self.incidents_df["DateResolution"].to_numpy("datetime64[ns]")[mask].view(np.int64)
+        hours = (end - start).astype(np.float64) / 3_600_000_000_000.0
+
         # Filter out negative values (data quality issues)
-        valid_resolution_times = resolved_incidents[
-            resolved_incidents["ResolutionTime"] >= 0
-        ]["ResolutionTime"]
-        
-        if valid_resolution_times.empty:
+        hours = hours[hours >= 0]
+
+        if hours.size == 0:
             return {"error": "No valid resolution times"}
-        
+
         return {
-            "mttr_hours": valid_resolution_times.mean(),
-            "median_hours": valid_resolution_times.median(),
-            "min_hours": valid_resolution_times.min(),
-            "max_hours": valid_resolution_times.max(),
-            "std_hours": valid_resolution_times.std(),
-            "total_resolved": len(valid_resolution_times)
+            "mttr_hours": float(np.mean(hours)),
+            "median_hours": float(np.median(hours)),
+            "min_hours": float(hours.min()),
+            "max_hours": float(hours.max()),
+            "std_hours": float(np.std(hours, ddof=1)) if hours.size > 1 else np.nan,
+            "total_resolved": int(hours.size)
         }
     
     def generate_trend_analysis(self, window_size: int = 3) -> dict:
@@ -314,6 +609,44 @@ class CyberSecurityKPIs:
         
         return results
     
+    def _failure_arrays(self) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Sorted valid timestamps and cumulative failure counts, once per load.
+
+        La somme cumulée ramène toute moyenne avant/après une coupure
+        arbitraire à deux soustractions — utile quand on balaie plusieurs
+        dates de campagne sur les mêmes données.
+        """
+        if "failure_arrays" in self._cache:
+            return self._cache["failure_arrays"]
+
+        mask = self._login_dt_valid() & (
+            self.logins_df["Resultat"].notna() &
+            (self.logins_df["Resultat"] != "unknown")
+        ).to_numpy()
+
+        if not mask.any():
+            self._cache["failure_arrays"] = (None, None)
+            return None, None
+
+        if mask.all():
+            # cas courant après nettoyage : aucune ligne à écarter, on
+            # travaille sur les colonnes telles quelles sans copie fancy-index
+            dates = self.logins_df["DateHeure"].to_numpy()
+            fail = self.logins_df["_is_fail"].to_numpy()
+        else:
+            dates = self.logins_df["DateHeure"].to_numpy()[mask]
+            fail = self.logins_df["_is_fail"].to_numpy()[mask]
+        # load_data trie déjà par DateHeure ; le tri défensif ne reste que
+        # pour un DataFrame injecté à la main
+        if not self._sorted and dates.size > 1 and (dates[1:] < dates[:-1]).any():
+            order = np.argsort(dates, kind="stable")
+            dates = dates[order]
+            fail = fail[order]
+
+        cumfail = np.cumsum(fail, dtype=np.int64)
+        self._cache["failure_arrays"] = (dates, cumfail)
+        return dates, cumfail
+
     def compare_periods(self, cutoff_date: str, metric: str = "failure_rate") -> dict:
         """Compare metrics before and after a specific date (e.g., security campaign)."""
         cutoff = pd.to_datetime(cutoff_date)
@@ -322,34 +655,31 @@ class CyberSecurityKPIs:
             print("Aucune donnée de login disponible")
             return {"error": "No login data available"}
         
-        # Filter valid data
-        valid_data = self.logins_df[
-            self.logins_df["DateHeure"].notna() & 
-            self.logins_df["Resultat"].notna() &
-            (self.logins_df["Resultat"] != "unknown")
-        ]
-        
-        if valid_data.empty:
+        dates, cumfail = self._failure_arrays()
+        if dates is None:
             print("Aucune donnée valide pour la comparaison")
             return {"error": "No valid data for comparison"}
-        
-        before_data = valid_data[valid_data["DateHeure"] < cutoff]
-        after_data = valid_data[valid_data["DateHeure"] >= cutoff]
-        
+
         if metric == "failure_rate":
-            before_rate = (before_data["Resultat"] == "échec").mean() if len(before_data) > 0 else 0
-            after_rate = (after_data["Resultat"] == "échec").mean() if len(after_data) > 0 else 0
-            
+            # Coupure par recherche binaire puis différences de sommes
+            # cumulées : O(1) par date de coupure après la passe initiale
+            split = int(np.searchsorted(dates, cutoff.to_datetime64()))
+            before_count = split
+            after_count = dates.size - split
+            fails_before = int(cumfail[split - 1]) if split > 0 else 0
+            before_rate = fails_before / before_count if before_count > 0 else 0
+            after_rate = (int(cumfail[-1]) - fails_before) / after_count if after_count > 0 else 0
+
             result = {
                 "metric": "failure_rate",
                 "cutoff_date": cutoff_date,
                 "before_period": {
                     "rate": before_rate,
-                    "count": len(before_data)
+                    "count": before_count
                 },
                 "after_period": {
                     "rate": after_rate,
-                    "count": len(after_data)
+                    "count": after_count
                 },
                 "improvement": before_rate - after_rate,
                 "improvement_pct": ((before_rate - after_rate) / before_rate * 100) if before_rate > 0 else 0
@@ -364,7 +694,10 @@ class CyberSecurityKPIs:
             raise ValueError(f"Métrique non supportée: {metric}")
     
     def generate_executive_summary(self) -> dict:
-        """Generate executive summary with key metrics."""
+        """Generate executive summary with key metrics, memoized per load."""
+        if "executive_summary" in self._cache:
+            return self._cache["executive_summary"]
+
         summary = {
             "period": {"start": "N/A", "end": "N/A"},
             "incidents": {
@@ -383,55 +716,72 @@ class CyberSecurityKPIs:
             "trends": {}
         }
         
-        # Process incidents data
+        # Process incidents data — les colonnes utiles sont extraites une fois
+        # en tableaux numpy, puis réduites ; aucune tranche de DataFrame
         if self.incidents_df is not None and not self.incidents_df.empty:
-            valid_incidents = self.incidents_df[self.incidents_df["Date"].notna()]
-            if not valid_incidents.empty:
-                summary["period"]["start"] = valid_incidents["Date"].min().strftime("%Y-%m-%d")
-                summary["period"]["end"] = valid_incidents["Date"].max().strftime("%Y-%m-%d")
-                summary["incidents"]["total_count"] = len(valid_incidents)
-                
-                if "ImpactAriary" in valid_incidents.columns:
-                    impact_data = valid_incidents[valid_incidents["ImpactAriary"].notna()]
-                    summary["incidents"]["total_impact"] = impact_data["ImpactAriary"].sum()
-                
-                summary["incidents"]["avg_monthly"] = len(valid_incidents) / max(1, valid_incidents["Date"].dt.to_period("M").nunique())
-                
-                if "Secteur" in valid_incidents.columns:
-                    sector_data = valid_incidents[valid_incidents["Secteur"].notna()]
-                    if not sector_data.empty:
-                        summary["incidents"]["most_affected_sector"] = sector_data["Secteur"].mode().iloc[0]
-                
+            date_valid = self._incident_date_valid()
+            if date_valid.any():
+                dates = self.incidents_df["Date"].to_numpy()[date_valid]
+                summary["period"]["start"] = pd.Timestamp(dates.min()).strftime("%Y-%m-%d")
+                summary["period"]["end"] = pd.Timestamp(dates.max()).strftime("%Y-%m-%d")
+                summary["incidents"]["total_count"] = int(date_valid.sum())
+
+                if "ImpactAriary" in self.incidents_df.columns:
+                    impact = self.incidents_df["ImpactAriary"].to_numpy()[date_valid]
+                    summary["incidents"]["total_impact"] = float(np.nansum(impact, dtype=np.float64))
+
+                # Le nombre de mois actifs est la longueur de la série mensuelle
+                # déjà mémoïsée : pas de seconde passe PeriodArray sur Date
+                n_months = len(self.calculate_monthly_incidents())
+                if n_months == 0:
+                    n_months = self.incidents_df["Date"].dt.to_period("M").nunique()
+                summary["incidents"]["avg_monthly"] = summary["incidents"]["total_count"] / max(1, n_months)
+
+                if "Secteur" in self.incidents_df.columns:
+                    sectors = self.incidents_df["Secteur"]
+                    if isinstance(sectors.dtype, pd.CategoricalDtype):
+                        # argmax sur comptage au lieu de mode() : O(N) sans tri
+                        codes = sectors.cat.codes.to_numpy()[date_valid]
+                        counts = np.bincount(codes[codes >= 0],
+                                             minlength=len(sectors.cat.categories))
+                        if counts.sum() > 0:
+                            summary["incidents"]["most_affected_sector"] = sectors.cat.categories[counts.argmax()]
+                    else:
+                        sector_data = sectors[date_valid & sectors.notna().to_numpy()]
+                        if not sector_data.empty:
+                            summary["incidents"]["most_affected_sector"] = sector_data.value_counts().idxmax()
+
                 # Add MTTR
                 mttr_data = self.calculate_mttr()
                 if "error" not in mttr_data:
                     summary["incidents"]["avg_resolution_time"] = f"{mttr_data['mttr_hours']:.1f} heures"
-        
+
         # Process logins data
         if self.logins_df is not None and not self.logins_df.empty:
-            valid_logins = self.logins_df[self.logins_df["DateHeure"].notna()]
-            if not valid_logins.empty:
-                summary["logins"]["total_attempts"] = len(valid_logins)
-                
-                if "Resultat" in valid_logins.columns:
-                    result_data = valid_logins[
-                        valid_logins["Resultat"].notna() & 
-                        (valid_logins["Resultat"] != "unknown")
-                    ]
-                    if not result_data.empty:
-                        summary["logins"]["failure_rate"] = (result_data["Resultat"] == "échec").mean()
-                
-                if "Utilisateur" in valid_logins.columns:
-                    user_data = valid_logins[valid_logins["Utilisateur"].notna()]
-                    summary["logins"]["unique_users"] = user_data["Utilisateur"].nunique()
-                
-                if "IPSource" in valid_logins.columns:
-                    ip_data = valid_logins[valid_logins["IPSource"].notna()]
-                    summary["logins"]["unique_ips"] = ip_data["IPSource"].nunique()
+            dt_valid = self._login_dt_valid()
+            if dt_valid.any():
+                summary["logins"]["total_attempts"] = int(dt_valid.sum())
+
+                if "Resultat" in self.logins_df.columns:
+                    # Taux d'échec depuis les tableaux déjà mis en cache par
+                    # compare_periods : zéro nouvelle passe sur les lignes
+                    fr_dates, cumfail = self._failure_arrays()
+                    if fr_dates is not None:
+                        summary["logins"]["failure_rate"] = float(cumfail[-1]) / fr_dates.size
+
+                for key, col in (("unique_users", "Utilisateur"), ("unique_ips", "IPSource")):
+                    if col in self.logins_df.columns:
+                        series = self.logins_df[col]
+                        if isinstance(series.dtype, pd.CategoricalDtype):
+                            codes = series.cat.codes.to_numpy()[dt_valid]
+                            summary["logins"][key] = int(np.unique(codes[codes >= 0]).size)
+                        else:
+                            summary["logins"][key] = int(series[dt_valid].nunique())
         
         # Add trend analysis
         summary["trends"] = self.generate_trend_analysis()
-        
+
+        self._cache["executive_summary"] = summary
         return summary
     
     def export_kpi_report(self, filename: str = "rapport_kpi_cybersecurite.txt") -> None:
@@ -492,17 +842,22 @@ class CyberSecurityKPIs:
         
         # Generate visualizations
         print("Génération des visualisations KPI...")
-        
+
+        # Chaque série KPI est calculée une fois puis passée aux tracés
+        monthly_incidents = self.calculate_monthly_incidents()
+        quarterly_impact = self.calculate_quarterly_impact()
+        monthly_failure_rate = self.calculate_monthly_failure_rate()
+
         if save_charts:
-            self.plot_monthly_incidents()
-            self.plot_quarterly_impact()
-            self.plot_monthly_failure_rate()
+            self.plot_monthly_incidents(monthly_incidents=monthly_incidents)
+            self.plot_quarterly_impact(quarterly_impact=quarterly_impact)
+            self.plot_monthly_failure_rate(monthly_failure_rate=monthly_failure_rate)
             self.plot_incident_severity_distribution()
             self.plot_top_attack_vectors()
         else:
-            self.plot_monthly_incidents(save_path=None)
-            self.plot_quarterly_impact(save_path=None)
-            self.plot_monthly_failure_rate(save_path=None)
+            self.plot_monthly_incidents(save_path=None, monthly_incidents=monthly_incidents)
+            self.plot_quarterly_impact(save_path=None, quarterly_impact=quarterly_impact)
+            self.plot_monthly_failure_rate(save_path=None, monthly_failure_rate=monthly_failure_rate)
             self.plot_incident_severity_distribution(save_path=None)
             self.plot_top_attack_vectors(save_path=None)
         
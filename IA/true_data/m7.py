@@ -1,51 +1,101 @@
 # m7_dashboard_fixed.py
 # Lance avec: streamlit run m7_dashboard_fixed.py
 import pandas as pd
-import matplotlib.pyplot as plt
 import streamlit as st
 import numpy as np
+import pyarrow.parquet as pq
 from pathlib import Path
 
 st.set_page_config(page_title="ESN Cybersécurité — Dashboard", layout="wide")
 
-@st.cache_data
+# cache_resource : références partagées entre reruns, sans la copie
+# défensive que cache_data ferait de chaque DataFrame retourné ; les
+# frames sont traités en lecture seule par la suite du script
+@st.cache_resource
 def load_data():
     """Load data with error handling for empty files."""
-    def safe_load_csv(filename, parse_dates=None):
+    def safe_load_csv(filename, parse_dates=None, usecols=None):
         try:
-            if Path(filename).exists():
-                df = pd.read_csv(filename, parse_dates=parse_dates, skip_blank_lines=True)
-                df = df.dropna(how='all')  # Remove completely empty rows
-                return df if not df.empty else None
+            csv_path = Path(filename)
+            pq_path = csv_path.with_suffix(".parquet")
+            if pq_path.exists() and (not csv_path.exists()
+                                     or pq_path.stat().st_mtime >= csv_path.stat().st_mtime):
+                # Sidecar parquet (partagé avec m3/m5/m6) : colonnes typées et
+                # dates déjà converties, projection sur les colonnes utiles
+                available = pq.read_schema(pq_path).names
+                cols = [c for c in (usecols or []) if c in available]
+                df = pd.read_parquet(pq_path, columns=cols or None)
+            elif csv_path.exists():
+                # Tokenizer PyArrow multi-thread + lecture des seules colonnes
+                # consommées par le dashboard ; les lignes vides sont filtrées
+                # par le dropna(how='all')
+                df = pd.read_csv(filename, engine="pyarrow",
+                                 parse_dates=parse_dates, usecols=usecols)
             else:
                 return None
+            df = df.dropna(how='all')  # Remove completely empty rows
+            return df if not df.empty else None
         except Exception as e:
             st.warning(f"Erreur lors du chargement de {filename}: {e}")
             return None
-    
+
+    def fill_category(series, value):
+        # Remplissage compatible avec les colonnes déjà catégorielles issues
+        # du sidecar (la valeur de repli doit exister comme catégorie)
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            if series.isna().any():
+                if value not in series.cat.categories:
+                    series = series.cat.add_categories([value])
+                series = series.fillna(value)
+            return series
+        return series.fillna(value).astype("category")
+
     # Load each file with error handling
-    inc = safe_load_csv("incidents.csv", parse_dates=["Date"])
-    log = safe_load_csv("logins.csv", parse_dates=["DateHeure"])
+    inc = safe_load_csv("incidents.csv", parse_dates=["Date"],
+                        usecols=["Date", "Secteur", "TypeAttaque", "ImpactAriary"])
+    log = safe_load_csv("logins.csv", parse_dates=["DateHeure"],
+                        usecols=["DateHeure", "Resultat", "Role"])
     seg_ent = safe_load_csv("segments_entreprises.csv")
     seg_usr = safe_load_csv("segments_utilisateurs.csv")
-    risk = safe_load_csv("risque_utilisateur.csv")
+    risk = safe_load_csv("risque_utilisateur.csv",
+                         usecols=["Utilisateur", "Role", "Departement", "risk_score"])
     
     # Clean the loaded data
     if inc is not None:
         inc = inc.dropna(subset=["Date"])
-        inc["Secteur"] = inc["Secteur"].fillna("Unknown")
-        inc["TypeAttaque"] = inc["TypeAttaque"].fillna("unknown")
+        inc["Secteur"] = fill_category(inc["Secteur"], "Unknown")
+        inc["TypeAttaque"] = fill_category(inc["TypeAttaque"], "unknown")
         inc["ImpactAriary"] = inc["ImpactAriary"].fillna(0)
     
     if log is not None:
         log = log.dropna(subset=["DateHeure"])
-        log["Resultat"] = log["Resultat"].fillna("unknown").str.lower().str.strip()
-        log["Role"] = log["Role"].fillna("Unknown")
+        if not isinstance(log["Resultat"].dtype, pd.CategoricalDtype):
+            # le sidecar arrive déjà normalisé (minuscules, 'unknown')
+            log["Resultat"] = log["Resultat"].fillna("unknown").str.lower().str.strip().astype("category")
+        log["Role"] = fill_category(log["Role"], "Unknown")
+        # Indicateur d'échec calculé une seule fois au chargement : les
+        # graphiques mensuels font ensuite une simple moyenne d'entiers
+        log["is_fail"] = log["Resultat"].isin(["échec", "failure"]).astype(np.int8)
     
-    return inc, log, seg_ent, seg_usr, risk
+    # Agrégats mensuels précalculés une fois par chargement : les reruns de
+    # widgets ne font plus que des tranches O(mois) sur ces petites tables
+    monthly_inc = None
+    if inc is not None:
+        monthly_inc = (inc.groupby([pd.Grouper(key="Date", freq="ME"), "Secteur"],
+                                   observed=True)
+                          .size().unstack("Secteur", fill_value=0))
+    monthly_fail = None
+    if log is not None:
+        valid = log[log["Resultat"].isin(["échec", "succès", "success", "failure"])]
+        grp = valid.groupby([pd.Grouper(key="DateHeure", freq="ME"), "Role"],
+                            observed=True)["is_fail"]
+        monthly_fail = (grp.sum().unstack("Role", fill_value=0),
+                        grp.size().unstack("Role", fill_value=0))
+
+    return inc, log, seg_ent, seg_usr, risk, monthly_inc, monthly_fail
 
 # Load data
-inc, log, seg_ent, seg_usr, risk = load_data()
+inc, log, seg_ent, seg_usr, risk, monthly_inc, monthly_fail = load_data()
 
 st.title("IAro Tech — Dashboard")
 
@@ -73,17 +123,24 @@ if has_logins:
 else:
     role_sel = []
 
-# Filter data based on selections
-df_inc = inc.copy() if has_incidents else pd.DataFrame()
+# Filter data based on selections : un seul masque booléen cumulé, une seule
+# indexation — aucune copie intermédiaire à chaque rerun de widget
 if has_incidents:
+    mask = np.ones(len(inc), dtype=bool)
     if secteur_sel != "(Tous)":
-        df_inc = df_inc[df_inc["Secteur"] == secteur_sel]
+        # égalité entière sur les codes catégoriels plutôt que sur les chaînes
+        mask &= (inc["Secteur"].cat.codes.to_numpy()
+                 == inc["Secteur"].cat.categories.get_loc(secteur_sel))
     if type_att_sel:
-        df_inc = df_inc[df_inc["TypeAttaque"].isin(type_att_sel)]
+        mask &= inc["TypeAttaque"].isin(type_att_sel).to_numpy()
+    df_inc = inc if mask.all() else inc[mask]
+else:
+    df_inc = pd.DataFrame()
 
-df_log = log.copy() if has_logins else pd.DataFrame()
 if has_logins and role_sel:
-    df_log = df_log[df_log["Role"].isin(role_sel)]
+    df_log = log[log["Role"].isin(role_sel).to_numpy()]
+else:
+    df_log = log if has_logins else pd.DataFrame()
 
 # KPIs
 col1, col2, col3 = st.columns(3)
@@ -114,15 +171,20 @@ with col3:
 st.subheader("Incidents par mois")
 if has_incidents and not df_inc.empty:
     try:
-        inc_m = df_inc.set_index("Date").resample("M").size()
+        if type_att_sel or monthly_inc is None:
+            inc_m = df_inc.groupby(pd.Grouper(key="Date", freq="ME")).size()
+        else:
+            # tranche du tableau précalculé, ramenée à la plage active du
+            # secteur pour coller au groupby direct
+            inc_m = (monthly_inc.sum(axis=1) if secteur_sel == "(Tous)"
+                     else monthly_inc[secteur_sel])
+            nz = inc_m[inc_m > 0]
+            if not nz.empty:
+                inc_m = inc_m.loc[nz.index[0]:nz.index[-1]]
         if not inc_m.empty:
-            fig1, ax1 = plt.subplots(figsize=(10, 6))
-            inc_m.plot(ax=ax1, marker='o')
-            ax1.set_title("Incidents par mois")
-            ax1.set_xlabel("Mois")
-            ax1.set_ylabel("Incidents")
-            ax1.grid(True, alpha=0.3)
-            st.pyplot(fig1)
+            # graphe natif rendu côté client : pas de rasterisation Agg ni
+            # d'encodage PNG à chaque rerun
+            st.line_chart(inc_m.rename("Incidents"))
         else:
             st.info("Aucune donnée disponible pour le graphique des incidents mensuels")
     except Exception as e:
@@ -143,15 +205,7 @@ if has_incidents and not df_inc.empty and "ImpactAriary" in df_inc.columns:
         if not valid_impact.empty:
             imp_sec = valid_impact.groupby("Secteur")["ImpactAriary"].median().sort_values(ascending=False)
             if not imp_sec.empty:
-                fig2, ax2 = plt.subplots(figsize=(10, 6))
-                imp_sec.plot(kind="bar", ax=ax2)
-                ax2.set_title("Impact médian par secteur")
-                ax2.set_xlabel("Secteur")
-                ax2.set_ylabel("MGA médian")
-                plt.xticks(rotation=45, ha='right')
-                ax2.grid(True, alpha=0.3)
-                plt.tight_layout()
-                st.pyplot(fig2)
+                st.bar_chart(imp_sec.rename("MGA médian"))
             else:
                 st.info("Aucune donnée valide pour l'impact par secteur")
         else:
@@ -165,21 +219,25 @@ else:
 st.subheader("Taux d'échec des connexions (mensuel)")
 if has_logins and not df_log.empty:
     try:
-        # Filter valid login results
-        valid_logins = df_log[df_log["Resultat"].isin(["échec", "succès", "success", "failure"])]
-        if not valid_logins.empty:
-            log_m = (valid_logins.set_index("DateHeure")
-                    .resample("M")["Resultat"]
-                    .apply(lambda s: s.isin(["échec", "failure"]).mean()))
+        # Taux mensuel reconstruit depuis les tables (somme, effectif) par
+        # rôle précalculées au chargement — une tranche par rerun
+        fail_sums, fail_cnts = monthly_fail
+        if role_sel:
+            cols = [r for r in role_sel if r in fail_cnts.columns]
+        else:
+            cols = list(fail_cnts.columns)
+        s = fail_sums[cols].sum(axis=1)
+        c = fail_cnts[cols].sum(axis=1)
+        active = c[c > 0]
+        if not active.empty:
+            s = s.loc[active.index[0]:active.index[-1]]
+            c = c.loc[active.index[0]:active.index[-1]]
+            rate = np.full(len(s), np.nan)
+            np.divide(s.to_numpy(dtype=np.float64), c.to_numpy(dtype=np.float64),
+                      out=rate, where=c.to_numpy() > 0)
+            log_m = pd.Series(rate, index=s.index)
             if not log_m.empty:
-                fig3, ax3 = plt.subplots(figsize=(10, 6))
-                log_m.plot(ax=ax3, marker='s')
-                ax3.set_title("Taux d'échec (mensuel)")
-                ax3.set_xlabel("Mois")
-                ax3.set_ylabel("Taux")
-                ax3.yaxis.set_major_formatter(plt.FuncFormatter(lambda y, _: f'{y:.1%}'))
-                ax3.grid(True, alpha=0.3)
-                st.pyplot(fig3)
+                st.line_chart((log_m * 100).rename("Taux d'échec (%)"))
             else:
                 st.info("Aucune donnée disponible pour le taux d'échec mensuel")
         else:
@@ -218,7 +276,8 @@ st.subheader("Top 50 utilisateurs à risque")
 if risk is not None and not risk.empty:
     if "risk_score" in risk.columns:
         try:
-            top_risk = risk.sort_values("risk_score", ascending=False).head(50)
+            # sélection partielle par tas : O(N log 50) au lieu d'un tri complet
+            top_risk = risk.nlargest(50, "risk_score")
             st.dataframe(top_risk)
         except:
             st.dataframe(risk.head(50))